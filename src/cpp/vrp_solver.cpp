@@ -7,23 +7,115 @@
 #include <string>
 #include <sstream>
 #include <fstream>
+#include <limits>
+
+#ifndef _WIN32
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <fcntl.h>
+#include <unistd.h>
+#endif
 
 using namespace std;
 
+// Above this many points distances are computed on demand instead of being
+// cached in a dense n x n matrix (5000 points is ~200 MB of doubles)
+const size_t DENSE_MATRIX_POINT_LIMIT = 5000;
+
+// Slack used when comparing times so rounding never rejects an exact fit
+const double TIME_EPSILON = 1e-9;
+
+// Minimum time between two progress events when --progress is given
+const int PROGRESS_INTERVAL_MS = 200;
+
+// Version of the command line and output format, printed by --version.
+// Bump it on any change: vrp_wrapper rebuilds binaries reporting another one
+const int SOLVER_PROTOCOL = 3;
+
 // Data structures
 struct Point {
     double x, y;
     int demand;
     int id;
+    // Delivery window and service duration; travel time equals distance
+    double readyTime, dueTime, serviceTime;
     
-    Point(double x = 0, double y = 0, int demand = 0, int id = 0) 
-        : x(x), y(y), demand(demand), id(id) {}
+    Point(double x = 0, double y = 0, int demand = 0, int id = 0,
+          double readyTime = 0, double dueTime = numeric_limits<double>::infinity(), double serviceTime = 0) 
+        : x(x), y(y), demand(demand), id(id), readyTime(readyTime), dueTime(dueTime), serviceTime(serviceTime) {}
+};
+
+// Consecutive visits summarised so two segments can be joined in O(1):
+// duration from service start at first to service end at last, and the
+// earliest/latest service start at first that keeps every time window
+struct Segment {
+    int first, last;
+    double duration, earliest, latest;
+    bool feasible;
+};
+
+// forward[p] = depot + first p customers, backward[p] = customer p onwards + depot
+struct RouteSchedule {
+    vector<Segment> forward;
+    vector<Segment> backward;
+};
+
+// Read-only view of an external row-major n x n float64 distance matrix
+// (raw binary or the data section of a .npy file). On POSIX systems the
+// file is memory mapped so only the pages actually touched are loaded.
+class ExternalMatrix {
+private:
+    void* mapping = nullptr;
+    size_t mappedBytes = 0;
+    vector<double> buffer;
+    
+public:
+    const double* data = nullptr;
+    
+    // Fails unless the file holds exactly n x n values after `offset`: a
+    // matrix for a different number of points would be silently misindexed,
+    // and mapping past the end of a short file raises SIGBUS on access
+    bool open(const string& path, size_t offset, size_t n) {
+        size_t bytes = offset + n * n * sizeof(double);
+#ifndef _WIN32
+        int fd = ::open(path.c_str(), O_RDONLY);
+        if (fd < 0) return false;
+        struct stat info;
+        if (fstat(fd, &info) != 0 || (size_t)info.st_size != bytes) {
+            ::close(fd);
+            return false;
+        }
+        void* base = mmap(nullptr, bytes, PROT_READ, MAP_SHARED, fd, 0);
+        ::close(fd);
+        if (base == MAP_FAILED) return false;
+        mapping = base;
+        mappedBytes = bytes;
+        data = reinterpret_cast<const double*>(static_cast<const char*>(base) + offset);
+#else
+        ifstream file(path, ios::binary);
+        if (!file.is_open()) return false;
+        file.seekg(0, ios::end);
+        if ((size_t)file.tellg() != bytes) return false;
+        buffer.resize(n * n);
+        file.seekg(offset);
+        if (!file.read(reinterpret_cast<char*>(buffer.data()), n * n * sizeof(double))) return false;
+        data = buffer.data();
+#endif
+        return true;
+    }
+    
+    ~ExternalMatrix() {
+#ifndef _WIN32
+        if (mapping) munmap(mapping, mappedBytes);
+#endif
+    }
 };
 
 struct Route {
     vector<int> customers;
     double totalCost;
     int totalDemand;
+    RouteSchedule schedule; // Only maintained when time windows are present
     
     Route() : totalCost(0), totalDemand(0) {}
 };
@@ -32,14 +124,35 @@ class VRPSolver {
 private:
     vector<Point> points;
     vector<vector<double>> distanceMatrix;
+    bool useDistanceMatrix;
+    const double* externalMatrix; // Supplied travel costs, possibly asymmetric
+    bool symmetricCosts;
+    bool hasTimeWindows;
     int vehicleCapacity;
     int numVehicles;
     
+    // Progress reporting (--progress): throttled events on stderr
+    bool progressEnabled;
+    int movesApplied;
+    chrono::steady_clock::time_point startTime;
+    chrono::steady_clock::time_point lastProgress;
+    
     double calculateDistance(const Point& p1, const Point& p2) {
         return sqrt(pow(p1.x - p2.x, 2) + pow(p1.y - p2.y, 2));
     }
     
+    // Distance lookup used by all algorithms; falls back to computing the
+    // Euclidean distance when no dense matrix was built
+    double distance(int i, int j) {
+        if (externalMatrix) return externalMatrix[(size_t)i * points.size() + j];
+        if (useDistanceMatrix) return distanceMatrix[i][j];
+        return calculateDistance(points[i], points[j]);
+    }
+    
     void buildDistanceMatrix() {
+        useDistanceMatrix = !externalMatrix && points.size() <= DENSE_MATRIX_POINT_LIMIT;
+        if (!useDistanceMatrix) return;
+        
         int n = points.size();
         distanceMatrix.resize(n, vector<double>(n));
         
@@ -57,15 +170,79 @@ private:
         int lastCustomer = 0; // Start from depot
         
         for (int customer : route) {
-            cost += distanceMatrix[lastCustomer][customer];
+            cost += distance(lastCustomer, customer);
             lastCustomer = customer;
         }
         
         // Return to depot
-        cost += distanceMatrix[lastCustomer][0];
+        cost += distance(lastCustomer, 0);
         return cost;
     }
     
+    Segment nodeSegment(int i) {
+        const Point& p = points[i];
+        return {i, i, p.serviceTime, p.readyTime, p.dueTime, p.readyTime <= p.dueTime};
+    }
+    
+    // Join segment a followed by segment b
+    Segment concat(const Segment& a, const Segment& b) {
+        double delta = a.duration + distance(a.last, b.first);
+        double wait = max(b.earliest - delta - a.latest, 0.0);
+        double warp = a.earliest + delta - b.latest;
+        return {a.first, b.last,
+                delta + b.duration + wait,
+                max(b.earliest - delta, a.earliest) - wait,
+                min(b.latest - delta, a.latest),
+                a.feasible && b.feasible && warp <= TIME_EPSILON};
+    }
+    
+    RouteSchedule buildSchedule(const vector<int>& route) {
+        RouteSchedule schedule;
+        if (!hasTimeWindows) return schedule;
+        
+        schedule.forward.push_back(nodeSegment(0));
+        for (int customer : route) {
+            schedule.forward.push_back(concat(schedule.forward.back(), nodeSegment(customer)));
+        }
+        schedule.backward.push_back(nodeSegment(0));
+        for (int k = (int)route.size() - 1; k >= 0; k--) {
+            schedule.backward.push_back(concat(nodeSegment(route[k]), schedule.backward.back()));
+        }
+        reverse(schedule.backward.begin(), schedule.backward.end());
+        return schedule;
+    }
+    
+    // O(1) time-window check for inserting customer before position
+    bool canInsert(const RouteSchedule& schedule, int customer, int position) {
+        if (!hasTimeWindows) return true;
+        Segment head = concat(schedule.forward[position], nodeSegment(customer));
+        return head.feasible && concat(head, schedule.backward[position]).feasible;
+    }
+    
+    bool isRouteFeasible(const vector<int>& route) {
+        if (!hasTimeWindows) return true;
+        Segment segment = nodeSegment(0);
+        for (int customer : route) {
+            segment = concat(segment, nodeSegment(customer));
+        }
+        return concat(segment, nodeSegment(0)).feasible;
+    }
+    
+    // Cheapest position to insert customer that keeps every time window, or -1
+    int bestFeasibleInsertion(int customer, const Route& route) {
+        int bestPos = -1;
+        double bestCost = numeric_limits<double>::infinity();
+        for (int pos = 0; pos <= route.customers.size(); pos++) {
+            if (!canInsert(route.schedule, customer, pos)) continue;
+            double cost = calculateInsertionCost(customer, route.customers, pos);
+            if (cost < bestCost) {
+                bestCost = cost;
+                bestPos = pos;
+            }
+        }
+        return bestPos;
+    }
+    
     int calculateRouteDemand(const vector<int>& route) {
         int demand = 0;
         for (int customer : route) {
@@ -75,9 +252,56 @@ private:
     }
 
 public:
-    VRPSolver(const vector<Point>& points, int vehicleCapacity, int numVehicles) 
-        : points(points), vehicleCapacity(vehicleCapacity), numVehicles(numVehicles) {
+    VRPSolver(const vector<Point>& points, int vehicleCapacity, int numVehicles,
+              const double* externalMatrix = nullptr, bool symmetricCosts = true) 
+        : points(points), externalMatrix(externalMatrix), symmetricCosts(symmetricCosts),
+          vehicleCapacity(vehicleCapacity), numVehicles(numVehicles),
+          progressEnabled(false), movesApplied(0) {
+        startTime = lastProgress = chrono::steady_clock::now();
         buildDistanceMatrix();
+        
+        hasTimeWindows = false;
+        for (const Point& p : this->points) {
+            if (p.readyTime != 0 || p.serviceTime != 0 || !isinf(p.dueTime)) hasTimeWindows = true;
+        }
+    }
+    
+    void enableProgress() {
+        progressEnabled = true;
+    }
+    
+    // Emit a progress event followed by a snapshot of the current routes:
+    //   PROGRESS <phase> <assigned> <customers> <cost> <moves> <elapsed>
+    //   SNAPSHOT
+    //   <routes in the same format as the final output>
+    // Events closer together than PROGRESS_INTERVAL_MS are dropped unless forced
+    void reportProgress(const char* phase, const vector<Route>& routes, int assigned, bool force = false) {
+        if (!progressEnabled) return;
+        auto now = chrono::steady_clock::now();
+        if (!force && now - lastProgress < chrono::milliseconds(PROGRESS_INTERVAL_MS)) return;
+        lastProgress = now;
+        
+        double cost = 0;
+        for (const auto& route : routes) cost += route.totalCost;
+        double elapsed = chrono::duration<double>(now - startTime).count();
+        cerr << "PROGRESS " << phase << " " << assigned << " " << points.size() - 1 << " "
+             << cost << " " << movesApplied << " " << elapsed << "\n";
+        cerr << "SNAPSHOT\n" << routesToString(routes);
+        cerr.flush();
+    }
+    
+    // Savings of serving j straight after i instead of on separate routes;
+    // with asymmetric costs both directions of every pair are considered
+    vector<pair<double, pair<int, int>>> calculateSavings() {
+        vector<pair<double, pair<int, int>>> savings;
+        for (int i = 1; i < points.size(); i++) {
+            for (int j = symmetricCosts ? i + 1 : 1; j < points.size(); j++) {
+                if (i == j) continue;
+                double saving = distance(i, 0) + distance(0, j) - distance(i, j);
+                savings.push_back({saving, {i, j}});
+            }
+        }
+        return savings;
     }
     
     // Enhanced Custom Algorithm (Multi-factor scoring approach)
@@ -85,16 +309,12 @@ public:
         vector<Route> routes;
         vector<bool> visited(points.size(), false);
         visited[0] = true; // Depot is always visited
+        int assigned = 0;
         
         // First, create initial routes using savings approach for pairs
-        vector<pair<double, pair<int, int>>> savings;
-        for (int i = 1; i < points.size(); i++) {
-            for (int j = i + 1; j < points.size(); j++) {
-                double saving = distanceMatrix[0][i] + distanceMatrix[0][j] - distanceMatrix[i][j];
-                savings.push_back({saving, {i, j}});
-            }
-        }
+        vector<pair<double, pair<int, int>>> savings = calculateSavings();
         sort(savings.rbegin(), savings.rend());
+        reportProgress("savings", routes, assigned, true);
         
         // Create initial routes using savings
         for (auto& saving : savings) {
@@ -103,17 +323,23 @@ public:
             
             if (!visited[i] && !visited[j]) {
                 int totalDemand = points[i].demand + points[j].demand;
-                if (totalDemand <= vehicleCapacity) {
+                if (totalDemand <= vehicleCapacity && isRouteFeasible({i, j})) {
                     Route route;
                     route.customers = {i, j};
                     route.totalDemand = totalDemand;
                     route.totalCost = calculateRouteCost(route.customers);
+                    route.schedule = buildSchedule(route.customers);
                     routes.push_back(route);
                     visited[i] = visited[j] = true;
+                    assigned += 2;
+                    reportProgress("construct", routes, assigned);
                 }
             }
         }
         
+        Route emptyRoute;
+        emptyRoute.schedule = buildSchedule(emptyRoute.customers);
+        
         // Multi-factor scoring approach for remaining customers
         while (true) {
             bool foundCustomer = false;
@@ -149,7 +375,7 @@ public:
                     if (visited[customer]) continue;
                     
                     if (routes.size() < numVehicles) {
-                        double score = calculateCustomScore(customer, Route());
+                        double score = calculateCustomScore(customer, emptyRoute);
                         
                         if (score > bestScore) {
                             bestScore = score;
@@ -170,38 +396,57 @@ public:
                 newRoute.customers = {bestCustomer};
                 newRoute.totalDemand = points[bestCustomer].demand;
                 newRoute.totalCost = calculateRouteCost(newRoute.customers);
+                newRoute.schedule = buildSchedule(newRoute.customers);
                 routes.push_back(newRoute);
             } else {
-                // Add to existing route
-                routes[bestRouteIndex].customers.push_back(bestCustomer);
-                routes[bestRouteIndex].totalDemand += points[bestCustomer].demand;
-                routes[bestRouteIndex].totalCost = calculateRouteCost(routes[bestRouteIndex].customers);
+                // Add to existing route (at the cheapest feasible position
+                // when time windows rule out simply appending)
+                Route& route = routes[bestRouteIndex];
+                if (hasTimeWindows) {
+                    int pos = bestFeasibleInsertion(bestCustomer, route);
+                    route.customers.insert(route.customers.begin() + pos, bestCustomer);
+                } else {
+                    route.customers.push_back(bestCustomer);
+                }
+                route.totalDemand += points[bestCustomer].demand;
+                route.totalCost = calculateRouteCost(route.customers);
+                route.schedule = buildSchedule(route.customers);
             }
             
             visited[bestCustomer] = true;
+            assigned++;
+            reportProgress("construct", routes, assigned);
         }
+        reportProgress("construct", routes, assigned, true);
         
         // Apply 2-opt optimization to each route
         for (auto& route : routes) {
             optimizeRoute2Opt(route);
+            reportProgress("improve", routes, assigned);
         }
         
+        reportProgress("done", routes, assigned, true);
         return routes;
     }
     
     // Calculate custom scoring for customer-route combination
+    // Positions that break a time window are skipped; -1 means no position fits
     double calculateCustomScore(int customer, const Route& route) {
         if (route.customers.empty()) {
+            if (!canInsert(route.schedule, customer, 0)) return -1;
+            
             // For new route, calculate distance from depot
-            double distance = distanceMatrix[0][customer];
+            double depotDistance = distance(0, customer);
             double demandRatio = (double)points[customer].demand / vehicleCapacity;
             // Balance distance and demand efficiency
-            return (1.0 / distance) * (1.0 + 0.5 * demandRatio);
+            return (1.0 / depotDistance) * (1.0 + 0.5 * demandRatio);
         } else {
             // For existing route, find best insertion position
             double bestScore = -1;
             
             for (int pos = 0; pos <= route.customers.size(); pos++) {
+                if (!canInsert(route.schedule, customer, pos)) continue;
+                
                 // Calculate distance if customer inserted at this position
                 double insertionCost = calculateInsertionCost(customer, route.customers, pos);
                 double demandRatio = (double)points[customer].demand / vehicleCapacity;
@@ -228,7 +473,7 @@ public:
     // Calculate cost of inserting customer at specific position
     double calculateInsertionCost(int customer, const vector<int>& route, int position) {
         if (route.empty()) {
-            return distanceMatrix[0][customer] + distanceMatrix[customer][0];
+            return distance(0, customer) + distance(customer, 0);
         }
         
         vector<int> newRoute = route;
@@ -244,9 +489,21 @@ public:
         while (improved) {
             improved = false;
             double bestCost = calculateRouteCost(route.customers);
+            RouteSchedule schedule = buildSchedule(route.customers);
             
             for (int i = 0; i < route.customers.size() - 1; i++) {
+                Segment reversedSegment;
+                if (hasTimeWindows) reversedSegment = nodeSegment(route.customers[i + 1]);
+                
                 for (int j = i + 2; j < route.customers.size(); j++) {
+                    if (hasTimeWindows) {
+                        // Grow the reversed block i+1..j by one customer in O(1)
+                        reversedSegment = concat(nodeSegment(route.customers[j]), reversedSegment);
+                        if (!reversedSegment.feasible) break;
+                        Segment head = concat(schedule.forward[i + 1], reversedSegment);
+                        if (!head.feasible || !concat(head, schedule.backward[j + 1]).feasible) continue;
+                    }
+                    
                     // Try 2-opt swap
                     vector<int> newRoute = route.customers;
                     reverse(newRoute.begin() + i + 1, newRoute.begin() + j + 1);
@@ -255,8 +512,10 @@ public:
                     if (newCost < bestCost) {
                         route.customers = newRoute;
                         route.totalCost = newCost;
+                        route.schedule = buildSchedule(route.customers);
                         bestCost = newCost;
                         improved = true;
+                        movesApplied++;
                         break;
                     }
                 }
@@ -270,10 +529,12 @@ public:
         vector<Route> routes;
         vector<bool> visited(points.size(), false);
         visited[0] = true; // Depot is always visited
+        int assigned = 0;
         
         while (true) {
             Route currentRoute;
             int currentVehicle = 0;
+            double currentTime = points[0].readyTime + points[0].serviceTime;
             
             while (currentVehicle < numVehicles && currentRoute.totalDemand < vehicleCapacity) {
                 int nearestCustomer = -1;
@@ -281,9 +542,16 @@ public:
                 
                 for (int i = 1; i < points.size(); i++) {
                     if (!visited[i] && currentRoute.totalDemand + points[i].demand <= vehicleCapacity) {
-                        double distance = distanceMatrix[currentVehicle][i];
-                        if (distance < minDistance) {
-                            minDistance = distance;
+                        if (hasTimeWindows) {
+                            // Arrive within the window and still get back to the depot in time
+                            double arrival = currentTime + distance(currentVehicle, i);
+                            if (arrival > points[i].dueTime + TIME_EPSILON) continue;
+                            double departure = max(arrival, points[i].readyTime) + points[i].serviceTime;
+                            if (departure + distance(i, 0) > points[0].dueTime + TIME_EPSILON) continue;
+                        }
+                        double candidateDistance = distance(currentVehicle, i);
+                        if (candidateDistance < minDistance) {
+                            minDistance = candidateDistance;
                             nearestCustomer = i;
                         }
                     }
@@ -291,6 +559,8 @@ public:
                 
                 if (nearestCustomer == -1) break;
                 
+                double arrival = currentTime + distance(currentVehicle, nearestCustomer);
+                currentTime = max(arrival, points[nearestCustomer].readyTime) + points[nearestCustomer].serviceTime;
                 currentRoute.customers.push_back(nearestCustomer);
                 currentRoute.totalDemand += points[nearestCustomer].demand;
                 visited[nearestCustomer] = true;
@@ -301,8 +571,11 @@ public:
             
             currentRoute.totalCost = calculateRouteCost(currentRoute.customers);
             routes.push_back(currentRoute);
+            assigned += currentRoute.customers.size();
+            reportProgress("construct", routes, assigned);
         }
         
+        reportProgress("done", routes, assigned, true);
         return routes;
     }
     
@@ -311,17 +584,13 @@ public:
         vector<Route> routes;
         vector<bool> visited(points.size(), false);
         visited[0] = true;
+        int assigned = 0;
         
         // Calculate savings
-        vector<pair<double, pair<int, int>>> savings;
-        for (int i = 1; i < points.size(); i++) {
-            for (int j = i + 1; j < points.size(); j++) {
-                double saving = distanceMatrix[0][i] + distanceMatrix[0][j] - distanceMatrix[i][j];
-                savings.push_back({saving, {i, j}});
-            }
-        }
+        vector<pair<double, pair<int, int>>> savings = calculateSavings();
         
         sort(savings.rbegin(), savings.rend());
+        reportProgress("savings", routes, assigned, true);
         
         // Create routes based on savings
         for (auto& saving : savings) {
@@ -330,13 +599,16 @@ public:
             
             if (!visited[i] && !visited[j]) {
                 int totalDemand = points[i].demand + points[j].demand;
-                if (totalDemand <= vehicleCapacity) {
+                if (totalDemand <= vehicleCapacity && isRouteFeasible({i, j})) {
                     Route route;
                     route.customers = {i, j};
                     route.totalDemand = totalDemand;
                     route.totalCost = calculateRouteCost(route.customers);
+                    route.schedule = buildSchedule(route.customers);
                     routes.push_back(route);
                     visited[i] = visited[j] = true;
+                    assigned += 2;
+                    reportProgress("construct", routes, assigned);
                 }
             }
         }
@@ -347,24 +619,105 @@ public:
                 bool added = false;
                 for (auto& route : routes) {
                     if (route.totalDemand + points[i].demand <= vehicleCapacity) {
-                        route.customers.push_back(i);
+                        if (hasTimeWindows) {
+                            int pos = bestFeasibleInsertion(i, route);
+                            if (pos == -1) continue;
+                            route.customers.insert(route.customers.begin() + pos, i);
+                        } else {
+                            route.customers.push_back(i);
+                        }
                         route.totalDemand += points[i].demand;
                         route.totalCost = calculateRouteCost(route.customers);
+                        route.schedule = buildSchedule(route.customers);
                         added = true;
                         break;
                     }
                 }
                 
-                if (!added && routes.size() < numVehicles) {
+                if (!added && routes.size() < numVehicles && isRouteFeasible({i})) {
                     Route route;
                     route.customers = {i};
                     route.totalDemand = points[i].demand;
                     route.totalCost = calculateRouteCost(route.customers);
+                    route.schedule = buildSchedule(route.customers);
                     routes.push_back(route);
+                    added = true;
+                }
+                if (added) {
+                    assigned++;
+                    reportProgress("construct", routes, assigned);
                 }
             }
         }
         
+        reportProgress("done", routes, assigned, true);
+        return routes;
+    }
+    
+    // Sweep Algorithm: fill vehicles in polar-angle order around the depot,
+    // O(n log n) construction using only O(n) distances
+    vector<Route> sweepAlgorithm(bool improve) {
+        vector<Route> routes;
+        int n = points.size();
+        
+        // Sort customers by angle, then distance, around the depot
+        vector<double> angle(n), radius(n);
+        vector<int> order;
+        for (int i = 1; i < n; i++) {
+            double dx = points[i].x - points[0].x;
+            double dy = points[i].y - points[0].y;
+            angle[i] = atan2(dy, dx);
+            radius[i] = hypot(dx, dy);
+            order.push_back(i);
+        }
+        stable_sort(order.begin(), order.end(), [&](int a, int b) {
+            if (angle[a] != angle[b]) return angle[a] < angle[b];
+            return radius[a] < radius[b];
+        });
+        
+        Segment depot = nodeSegment(0);
+        // Capacity and, with time windows, still back at the depot in time
+        auto fits = [&](const Segment& segment, int routeDemand, int customer) {
+            if (routeDemand + points[customer].demand > vehicleCapacity) return false;
+            if (!hasTimeWindows) return true;
+            Segment extended = concat(segment, nodeSegment(customer));
+            return extended.feasible && concat(extended, depot).feasible;
+        };
+        
+        Route currentRoute;
+        Segment segment = depot;
+        int assigned = 0;
+        for (int customer : order) {
+            if (!fits(segment, currentRoute.totalDemand, customer)) {
+                // Cannot be served even by an empty vehicle
+                if (currentRoute.customers.empty() || !fits(depot, 0, customer)) continue;
+                // Every vehicle is in use; try the next customer on this one
+                if ((int)routes.size() + 1 >= numVehicles) continue;
+                routes.push_back(currentRoute);
+                currentRoute = Route();
+                segment = depot;
+            }
+            
+            currentRoute.customers.push_back(customer);
+            currentRoute.totalDemand += points[customer].demand;
+            assigned++;
+            if (hasTimeWindows) segment = concat(segment, nodeSegment(customer));
+        }
+        if (!currentRoute.customers.empty()) routes.push_back(currentRoute);
+        
+        for (auto& route : routes) {
+            route.totalCost = calculateRouteCost(route.customers);
+        }
+        reportProgress("construct", routes, assigned, true);
+        
+        if (improve) {
+            for (auto& route : routes) {
+                optimizeRoute2Opt(route);
+                reportProgress("improve", routes, assigned);
+            }
+        }
+        
+        reportProgress("done", routes, assigned, true);
         return routes;
     }
     
@@ -396,12 +749,24 @@ vector<Point> readInputFromFile(const string& filename, int& vehicleCapacity, in
     int numPoints;
     file >> numPoints >> vehicleCapacity >> numVehicles;
     
+    // Each point line is "x y demand id" optionally followed by
+    // "readyTime dueTime serviceTime" (dueTime may be "inf")
     vector<Point> points;
-    for (int i = 0; i < numPoints; i++) {
-        double x, y;
-        int demand, id;
-        file >> x >> y >> demand >> id;
-        points.push_back(Point(x, y, demand, id));
+    string line;
+    while ((int)points.size() < numPoints && getline(file, line)) {
+        istringstream fields(line);
+        vector<string> tokens;
+        string token;
+        while (fields >> token) tokens.push_back(token);
+        if (tokens.size() < 4) continue;
+        
+        Point point(stod(tokens[0]), stod(tokens[1]), stoi(tokens[2]), stoi(tokens[3]));
+        if (tokens.size() >= 7) {
+            point.readyTime = stod(tokens[4]);
+            point.dueTime = stod(tokens[5]);
+            point.serviceTime = stod(tokens[6]);
+        }
+        points.push_back(point);
     }
     
     file.close();
@@ -409,14 +774,34 @@ vector<Point> readInputFromFile(const string& filename, int& vehicleCapacity, in
 }
 
 int main(int argc, char* argv[]) {
-    if (argc != 3) {
-        cerr << "Usage: " << argv[0] << " <algorithm> <input_file>" << endl;
-        cerr << "Algorithms: enhanced, nearest, clarke" << endl;
+    // --progress and --no-improve may appear anywhere; the remaining
+    // arguments are positional
+    bool progress = false;
+    bool improve = true;
+    vector<string> args;
+    for (int i = 1; i < argc; i++) {
+        if (string(argv[i]) == "--version") {
+            cout << "vrp_solver protocol " << SOLVER_PROTOCOL << endl;
+            return 0;
+        }
+        if (string(argv[i]) == "--progress") {
+            progress = true;
+        } else if (string(argv[i]) == "--no-improve") {
+            improve = false;
+        } else {
+            args.push_back(argv[i]);
+        }
+    }
+    
+    if (args.size() != 2 && args.size() != 5) {
+        cerr << "Usage: " << argv[0] << " <algorithm> <input_file> [<matrix_file> <byte_offset> symmetric|asymmetric] [--progress] [--no-improve]" << endl;
+        cerr << "       " << argv[0] << " --version" << endl;
+        cerr << "Algorithms: enhanced, nearest, clarke, sweep (--no-improve skips its 2-opt pass)" << endl;
         return 1;
     }
     
-    string algorithm = argv[1];
-    string inputFile = argv[2];
+    string algorithm = args[0];
+    string inputFile = args[1];
     
     int vehicleCapacity, numVehicles;
     vector<Point> points = readInputFromFile(inputFile, vehicleCapacity, numVehicles);
@@ -425,7 +810,20 @@ int main(int argc, char* argv[]) {
         return 1;
     }
     
-    VRPSolver solver(points, vehicleCapacity, numVehicles);
+    // Optional external float64 distance matrix, mapped rather than copied
+    ExternalMatrix matrix;
+    bool symmetricCosts = true;
+    if (args.size() == 5) {
+        if (!matrix.open(args[2], stoull(args[3]), points.size())) {
+            cerr << "Error: Cannot map distance matrix " << args[2] << " (expected exactly "
+                 << points.size() << " x " << points.size() << " float64 values)" << endl;
+            return 1;
+        }
+        symmetricCosts = args[4] != "asymmetric";
+    }
+    
+    VRPSolver solver(points, vehicleCapacity, numVehicles, matrix.data, symmetricCosts);
+    if (progress) solver.enableProgress();
     vector<Route> routes;
     
     if (algorithm == "enhanced") {
@@ -434,6 +832,8 @@ int main(int argc, char* argv[]) {
         routes = solver.nearestNeighborAlgorithm();
     } else if (algorithm == "clarke") {
         routes = solver.clarkeWrightAlgorithm();
+    } else if (algorithm == "sweep") {
+        routes = solver.sweepAlgorithm(improve);
     } else {
         cerr << "Unknown algorithm: " << algorithm << endl;
         return 1;
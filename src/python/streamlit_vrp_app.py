@@ -6,10 +6,12 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from vrp_wrapper import CppVRPWrapper
+from vrp_export import export_npz
 import plotly.graph_objects as go
 import pandas as pd
 import random
 import time
+import io
 
 # Version indicator for deployment
 VERSION = "2.2.0 - Enhanced Custom Algorithm with 2-opt optimization and advanced scoring"
@@ -218,13 +220,33 @@ if st.button("🚀 Solve VRP with All Algorithms"):
         # Get C++ wrapper
         cpp_wrapper = wrapper
         
+        # Live progress: each algorithm fills its quarter of the bar
+        progress_bar = st.progress(0.0, text="Starting...")
+        
+        def show_progress(name, index):
+            def callback(event):
+                done = event['assigned'] / max(1, event['total'])
+                progress_bar.progress(
+                    min(1.0, (index + done) / 4),
+                    text=f"{name}: {event['phase']} - {event['assigned']}/{event['total']} customers, "
+                         f"cost {event['cost']:.2f}, {event['moves']} moves"
+                )
+            return callback
+        
         # Solve with different algorithms
-        enhanced_routes = cpp_wrapper.solve_enhanced_custom(problem, vehicle_capacity, num_vehicles)
-        nearest_routes = cpp_wrapper.solve_nearest_neighbor(problem, vehicle_capacity, num_vehicles)
-        clarke_routes = cpp_wrapper.solve_clarke_wright(problem, vehicle_capacity, num_vehicles)
+        enhanced_routes = cpp_wrapper.solve_enhanced_custom(problem, vehicle_capacity, num_vehicles,
+                                                            progress_callback=show_progress("Enhanced Custom", 0))
+        nearest_routes = cpp_wrapper.solve_nearest_neighbor(problem, vehicle_capacity, num_vehicles,
+                                                            progress_callback=show_progress("Nearest Neighbor", 1))
+        clarke_routes = cpp_wrapper.solve_clarke_wright(problem, vehicle_capacity, num_vehicles,
+                                                        progress_callback=show_progress("Clarke-Wright", 2))
+        sweep_routes = cpp_wrapper.solve_sweep(problem, vehicle_capacity, num_vehicles,
+                                               progress_callback=show_progress("Sweep", 3))
+        progress_bar.progress(1.0, text="All algorithms finished")
         
         # Store results
         st.session_state.problem = problem
+        st.session_state.problem_settings = (vehicle_capacity, num_vehicles)
         st.session_state.results = {
             'Enhanced Custom': {
                 'routes': enhanced_routes,
@@ -240,6 +262,11 @@ if st.button("🚀 Solve VRP with All Algorithms"):
                 'routes': clarke_routes,
                 'totalCost': sum(route['totalCost'] for route in clarke_routes),
                 'numRoutes': len(clarke_routes)
+            },
+            'Sweep': {
+                'routes': sweep_routes,
+                'totalCost': sum(route['totalCost'] for route in sweep_routes),
+                'numRoutes': len(sweep_routes)
             }
         }
     
@@ -250,7 +277,7 @@ if 'results' in st.session_state:
     st.header("🎯 Algorithm Results")
     
     # Results metrics
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.subheader("Enhanced Custom")
@@ -273,6 +300,13 @@ if 'results' in st.session_state:
         st.metric("Total Cost", f"{st.session_state.results['Clarke-Wright']['totalCost']:.2f}")
         st.metric("Routes", st.session_state.results['Clarke-Wright']['numRoutes'])
     
+    with col4:
+        st.subheader("Sweep")
+        fig4 = plot_routes(st.session_state.problem, st.session_state.results['Sweep']['routes'])
+        st.plotly_chart(fig4, use_container_width=True, key="sweep_chart")
+        st.metric("Total Cost", f"{st.session_state.results['Sweep']['totalCost']:.2f}")
+        st.metric("Routes", st.session_state.results['Sweep']['numRoutes'])
+    
     # Performance comparison
     st.header("📈 Performance Comparison")
     
@@ -280,10 +314,11 @@ if 'results' in st.session_state:
     costs = [
         st.session_state.results['Enhanced Custom']['totalCost'],
         st.session_state.results['Nearest Neighbor']['totalCost'],
-        st.session_state.results['Clarke-Wright']['totalCost']
+        st.session_state.results['Clarke-Wright']['totalCost'],
+        st.session_state.results['Sweep']['totalCost']
     ]
     
-    algorithms = ['Enhanced Custom', 'Nearest Neighbor', 'Clarke-Wright']
+    algorithms = ['Enhanced Custom', 'Nearest Neighbor', 'Clarke-Wright', 'Sweep']
     
     fig = go.Figure(data=[
         go.Bar(
@@ -291,7 +326,7 @@ if 'results' in st.session_state:
             y=costs,
             text=[f'{cost:.2f}' for cost in costs],
             textposition='auto',
-            marker_color=['#1f77b4', '#ff7f0e', '#2ca02c']
+            marker_color=['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
         )
     ])
     
@@ -317,6 +352,18 @@ if 'results' in st.session_state:
     for i, (algorithm, result) in enumerate(sorted_results):
         medal = medals[i] if i < 3 else '🏅'
         st.markdown(f"{medal} **{algorithm}**: {result['totalCost']:.2f} (Cost)")
+    
+    # Bulk export of every algorithm's routes in one columnar file
+    export_buffer = io.BytesIO()
+    solved_capacity, solved_vehicles = st.session_state.problem_settings
+    export_npz(export_buffer, st.session_state.problem, solved_capacity, solved_vehicles,
+               {name: result['routes'] for name, result in st.session_state.results.items()})
+    st.download_button(
+        "💾 Download Routes (.npz)",
+        data=export_buffer.getvalue(),
+        file_name="vrp_solutions.npz",
+        key="export_npz_button"
+    )
 
 # Footer
 st.markdown("---")
@@ -1,29 +1,93 @@
 #!/usr/bin/env python3
 
-import math
 import random
+import time
 from typing import List, Dict, Tuple
 
+import numpy as np
+
+from vrp_distance import DistanceOracle, DenseDistanceMatrix, build_distance_oracle
+from vrp_exact import EXACT_ROUTE_SIZE, optimal_route
+from vrp_time_windows import TimeWindows, has_time_windows, time_window_arrays, TIME_EPSILON
+
+# Minimum seconds between two progress events (phase ends are always sent)
+PROGRESS_INTERVAL = 0.2
+
+# Largest dense matrix mirrored as nested Python lists (~32 bytes per entry)
+ROW_LIST_POINT_LIMIT = 2000
+
 class VRPAlgorithms:
-    def __init__(self, points: List[Dict], vehicle_capacity: int, num_vehicles: int):
+    def __init__(self, points: List[Dict], vehicle_capacity: int, num_vehicles: int,
+                 distances: DistanceOracle = None, exact_route_size: int = EXACT_ROUTE_SIZE,
+                 progress_callback=None, progress_interval: float = PROGRESS_INTERVAL):
         self.points = points
         self.vehicle_capacity = vehicle_capacity
         self.num_vehicles = num_vehicles
-        self.distance_matrix = self._build_distance_matrix()
+        # Any DistanceOracle works here; the dense matrix is only the default
+        self.distances = distances if distances is not None else build_distance_oracle(points)
+        if len(self.distances) != len(points):
+            raise ValueError(f"Distance matrix covers {len(self.distances)} points but the problem has {len(points)}")
+        # Time windows are only tracked when the points define them
+        self.time_windows = TimeWindows(points, self.distances) if has_time_windows(points) else None
+        # Hot loops look distances up without a Python-level call: in-memory
+        # dense matrices up to ROW_LIST_POINT_LIMIT points are also copied to
+        # nested lists, which plain Python indexes fastest
+        dense = isinstance(self.distances, DenseDistanceMatrix)
+        self._distance = self.distances.matrix.item if dense else self.distances.distance
+        self._rows = None
+        if dense and not isinstance(self.distances.matrix, np.memmap) and len(self.distances) <= ROW_LIST_POINT_LIMIT:
+            self._rows = self.distances.matrix.tolist()
+        # Routes with at most this many customers are optimised exactly
+        self.exact_route_size = exact_route_size
+        # Optional callable receiving progress events (see _report_progress)
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+        self._start_progress()
+    
+    def _schedule(self, route: List[int]):
+        """Time-window bookkeeping for a route, or None without time windows"""
+        if self.time_windows is None:
+            return None
+        return self.time_windows.schedule(route)
+    
+    def _can_insert(self, schedule, customer: int, position: int) -> bool:
+        """O(1) time-window check for inserting customer at position"""
+        return schedule is None or self.time_windows.can_insert(schedule, customer, position)
     
-    def _build_distance_matrix(self):
-        """Build distance matrix between all points"""
-        n = len(self.points)
-        matrix = [[0] * n for _ in range(n)]
-        
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    dx = self.points[i]['x'] - self.points[j]['x']
-                    dy = self.points[i]['y'] - self.points[j]['y']
-                    matrix[i][j] = math.sqrt(dx*dx + dy*dy)
-        
-        return matrix
+    def _route_feasible(self, route: List[int]) -> bool:
+        return self.time_windows is None or self.time_windows.is_feasible(route)
+    
+    def _start_progress(self):
+        self.moves_applied = 0
+        self._progress_start = self._last_progress = time.perf_counter()
+    
+    def _report_progress(self, phase: str, routes: List[Dict], assigned: int, force: bool = False):
+        """Send a progress event with a snapshot of the current routes
+        
+        The event dict holds phase, assigned/total customers, current cost,
+        2-opt/exact moves applied, elapsed seconds and a copy of the routes.
+        Events closer together than `progress_interval` are dropped unless
+        forced.
+        """
+        if self.progress_callback is None:
+            return
+        now = time.perf_counter()
+        if not force and now - self._last_progress < self.progress_interval:
+            return
+        self._last_progress = now
+        
+        snapshot = [{'customers': list(route['customers']), 'totalCost': route['totalCost'],
+                     'totalDemand': route['totalDemand']} for route in routes]
+        self.progress_callback({
+            'backend': 'python',
+            'phase': phase,
+            'assigned': assigned,
+            'total': len(self.points) - 1,
+            'cost': sum(route['totalCost'] for route in snapshot),
+            'moves': self.moves_applied,
+            'elapsed': now - self._progress_start,
+            'routes': snapshot,
+        })
     
     def _calculate_route_cost(self, route: List[int]) -> float:
         """Calculate total cost of a route"""
@@ -33,12 +97,20 @@ class VRPAlgorithms:
         cost = 0
         last_point = 0  # Start from depot
         
+        rows = self._rows
+        if rows is not None:
+            for customer in route:
+                cost += rows[last_point][customer]
+                last_point = customer
+            return cost + rows[last_point][0]
+        
+        distance = self._distance
         for customer in route:
-            cost += self.distance_matrix[last_point][customer]
+            cost += distance(last_point, customer)
             last_point = customer
         
         # Return to depot
-        cost += self.distance_matrix[last_point][0]
+        cost += distance(last_point, 0)
         return cost
     
     def _calculate_route_demand(self, route: List[int]) -> int:
@@ -48,36 +120,18 @@ class VRPAlgorithms:
     def enhanced_custom_algorithm(self):
         """Enhanced Custom Algorithm with advanced optimization"""
         routes = []
+        schedules = []  # Time-window bookkeeping per route
+        empty_schedule = self._schedule([])
         visited = [False] * len(self.points)
         visited[0] = True
+        assigned = 0
+        self._start_progress()
         
         # Phase 1: Create initial routes using advanced scoring
         while True:
-            found_customer = False
-            best_score = -1
-            best_customer = -1
-            best_route_index = -1
-            
             # Try to add customers to existing routes
-            for customer in range(1, len(self.points)):
-                if visited[customer]:
-                    continue
-                
-                for route_index in range(len(routes)):
-                    route = routes[route_index]
-                    
-                    # Check capacity constraint
-                    if route['totalDemand'] + self.points[customer]['demand'] > self.vehicle_capacity:
-                        continue
-                    
-                    # Calculate advanced score for this customer-route combination
-                    score = self._calculate_advanced_score(customer, route)
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_customer = customer
-                        best_route_index = route_index
-                        found_customer = True
+            best_score, best_customer, best_route_index = self._best_route_assignment(routes, schedules, visited)
+            found_customer = best_customer >= 0
             
             # If no customer can be added to existing routes, create new route
             if not found_customer:
@@ -86,7 +140,7 @@ class VRPAlgorithms:
                         continue
                     
                     if len(routes) < self.num_vehicles:
-                        score = self._calculate_advanced_score(customer, {'customers': [], 'totalCost': 0, 'totalDemand': 0})
+                        score = self._calculate_advanced_score(customer, {'customers': [], 'totalCost': 0, 'totalDemand': 0}, empty_schedule)
                         
                         if score > best_score:
                             best_score = score
@@ -107,38 +161,74 @@ class VRPAlgorithms:
                 }
                 new_route['totalCost'] = self._calculate_route_cost(new_route['customers'])
                 routes.append(new_route)
+                schedules.append(self._schedule(new_route['customers']))
             else:
                 # Add to existing route with optimal insertion
-                best_insertion_cost = float('inf')
-                best_insertion_pos = 0
-                
-                for pos in range(len(routes[best_route_index]['customers']) + 1):
-                    new_route = routes[best_route_index]['customers'].copy()
-                    new_route.insert(pos, best_customer)
-                    cost = self._calculate_route_cost(new_route)
-                    if cost < best_insertion_cost:
-                        best_insertion_cost = cost
-                        best_insertion_pos = pos
+                best_insertion_pos = self._best_insertion_position(
+                    routes[best_route_index]['customers'], best_customer, schedules[best_route_index])
                 
                 routes[best_route_index]['customers'].insert(best_insertion_pos, best_customer)
                 routes[best_route_index]['totalDemand'] += self.points[best_customer]['demand']
                 routes[best_route_index]['totalCost'] = self._calculate_route_cost(routes[best_route_index]['customers'])
+                schedules[best_route_index] = self._schedule(routes[best_route_index]['customers'])
             
             visited[best_customer] = True
+            assigned += 1
+            self._report_progress('construct', routes, assigned)
+        self._report_progress('construct', routes, assigned, force=True)
         
-        # Phase 2: Optimize routes using 2-opt local search
+        # Phase 2: Optimize routes (exactly when short, otherwise 2-opt)
         for route in routes:
             if len(route['customers']) > 2:
-                route['customers'] = self._optimize_route_2opt(route['customers'])
+                route['customers'] = self._optimize_route(route['customers'])
                 route['totalCost'] = self._calculate_route_cost(route['customers'])
+                self._report_progress('improve', routes, assigned)
         
+        self._report_progress('done', routes, assigned, force=True)
         return routes
     
-    def _calculate_advanced_score(self, customer: int, route: Dict) -> float:
-        """Calculate advanced scoring for customer-route combination"""
+    def _best_route_assignment(self, routes: List[Dict], schedules: List, visited: List[bool]):
+        """Best-scoring (score, customer, route index) for adding an unvisited customer to an existing route
+        
+        Returns (-1, -1, -1) when no customer fits any route.
+        """
+        best_score = -1
+        best_customer = -1
+        best_route_index = -1
+        
+        for customer in range(1, len(self.points)):
+            if visited[customer]:
+                continue
+            
+            for route_index in range(len(routes)):
+                route = routes[route_index]
+                
+                # Check capacity constraint
+                if route['totalDemand'] + self.points[customer]['demand'] > self.vehicle_capacity:
+                    continue
+                
+                # Calculate advanced score for this customer-route combination
+                score = self._calculate_advanced_score(customer, route, schedules[route_index])
+                
+                if score > best_score:
+                    best_score = score
+                    best_customer = customer
+                    best_route_index = route_index
+        
+        return best_score, best_customer, best_route_index
+    
+    def _calculate_advanced_score(self, customer: int, route: Dict, schedule=None) -> float:
+        """Calculate advanced scoring for customer-route combination
+        
+        Positions that would break a time window are skipped; -1 means the
+        customer cannot be placed in the route at all.
+        """
         if not route['customers']:
+            if not self._can_insert(schedule, customer, 0):
+                return -1
+            
             # For new route, calculate distance from depot
-            distance = self.distance_matrix[0][customer]
+            distance = self._distance(0, customer)
             demand_ratio = self.points[customer]['demand'] / self.vehicle_capacity
             
             # Advanced scoring: balance distance, demand, and potential
@@ -151,30 +241,35 @@ class VRPAlgorithms:
             # For existing route, find best insertion position
             best_score = -1
             
-            for pos in range(len(route['customers']) + 1):
-                # Calculate cost if customer inserted at this position
-                insertion_cost = self._calculate_insertion_cost(customer, route['customers'], pos)
-                demand_ratio = self.points[customer]['demand'] / self.vehicle_capacity
-                
-                # Advanced penalty system
-                route_length_penalty = 1.0
-                if len(route['customers']) >= 5:
-                    route_length_penalty = 0.6  # Strong penalty for very long routes
-                elif len(route['customers']) >= 4:
-                    route_length_penalty = 0.8
-                elif len(route['customers']) >= 3:
-                    route_length_penalty = 0.9
+            # Everything but the insertion cost is the same for every position
+            customers = route['customers']
+            demand_ratio = self.points[customer]['demand'] / self.vehicle_capacity
+            
+            # Advanced penalty system
+            route_length_penalty = 1.0
+            if len(customers) >= 5:
+                route_length_penalty = 0.6  # Strong penalty for very long routes
+            elif len(customers) >= 4:
+                route_length_penalty = 0.8
+            elif len(customers) >= 3:
+                route_length_penalty = 0.9
+            
+            # Demand balancing - prefer routes closer to half capacity
+            current_demand = route['totalDemand']
+            new_demand = current_demand + self.points[customer]['demand']
+            capacity_ratio = new_demand / self.vehicle_capacity
+            balance_factor = 1.0 - abs(capacity_ratio - 0.7)  # Prefer 70% capacity
+            demand_efficiency = 1.0 + 1.0 * demand_ratio
+            
+            for pos in range(len(customers) + 1):
+                if schedule is not None and not self._can_insert(schedule, customer, pos):
+                    continue
                 
-                # Demand balancing - prefer routes closer to half capacity
-                current_demand = route['totalDemand']
-                new_demand = current_demand + self.points[customer]['demand']
-                capacity_ratio = new_demand / self.vehicle_capacity
-                balance_factor = 1.0 - abs(capacity_ratio - 0.7)  # Prefer 70% capacity
+                # Calculate cost if customer inserted at this position
+                insertion_cost = self._calculate_insertion_cost(customer, customers, pos)
                 
                 # Advanced scoring formula
                 distance_factor = 1.0 / (insertion_cost + 1.0)
-                demand_efficiency = 1.0 + 1.0 * demand_ratio
-                
                 score = distance_factor * demand_efficiency * route_length_penalty * balance_factor
                 
                 if score > best_score:
@@ -182,6 +277,21 @@ class VRPAlgorithms:
             
             return best_score
     
+    def _optimize_route(self, route: List[int]) -> List[int]:
+        """Optimal order for short routes (Held-Karp), 2-opt for longer ones"""
+        if len(route) < 3 or len(route) > self.exact_route_size:
+            return self._optimize_route_2opt(route)
+        
+        exact = optimal_route(self.distances, route)
+        # The exact order ignores time windows; keep it only if it still fits
+        if not self._route_feasible(exact):
+            return self._optimize_route_2opt(route)
+        # Ties (e.g. the same tour reversed) keep the current order
+        if self._calculate_route_cost(exact) < self._calculate_route_cost(route) - 1e-9:
+            self.moves_applied += 1
+            return exact
+        return route
+    
     def _optimize_route_2opt(self, route: List[int]) -> List[int]:
         """Optimize route using 2-opt local search"""
         if len(route) < 3:
@@ -192,9 +302,20 @@ class VRPAlgorithms:
         
         while improved:
             improved = False
+            schedule = self._schedule(route)
             
             for i in range(len(route) - 1):
+                reversed_segment = None if schedule is None else self.time_windows.node(route[i])
+                
                 for j in range(i + 2, len(route)):
+                    if schedule is not None:
+                        # Grow the reversed block route[i:j] by one customer in O(1)
+                        reversed_segment = self.time_windows.concat(self.time_windows.node(route[j - 1]), reversed_segment)
+                        if not reversed_segment.feasible:
+                            break
+                        if not self.time_windows.can_reverse(schedule, i, j, reversed_segment):
+                            continue
+                    
                     # Try 2-opt swap
                     new_route = route.copy()
                     new_route[i:j] = reversed(new_route[i:j])
@@ -204,16 +325,41 @@ class VRPAlgorithms:
                         route = new_route
                         best_cost = new_cost
                         improved = True
+                        self.moves_applied += 1
                         break
                 if improved:
                     break
         
         return route
     
+    def _best_insertion_position(self, route: List[int], customer: int, schedule=None):
+        """Cheapest position to insert customer that keeps every time window, or None"""
+        best_cost = float('inf')
+        best_pos = None
+        
+        for pos in range(len(route) + 1):
+            if not self._can_insert(schedule, customer, pos):
+                continue
+            new_route = route.copy()
+            new_route.insert(pos, customer)
+            cost = self._calculate_route_cost(new_route)
+            if cost < best_cost:
+                best_cost = cost
+                best_pos = pos
+        
+        return best_pos
+    
+    def _nearest_customer(self, row, visited, demands, current_demand) -> int:
+        """Nearest unvisited customer in a distance row that still fits the vehicle, or -1"""
+        feasible = ~visited & (current_demand + demands <= self.vehicle_capacity)
+        if not feasible.any():
+            return -1
+        return int(np.argmin(np.where(feasible, row, np.inf)))
+    
     def _calculate_insertion_cost(self, customer: int, route: List[int], position: int) -> float:
         """Calculate cost of inserting customer at specific position"""
         if not route:
-            return self.distance_matrix[0][customer] + self.distance_matrix[customer][0]
+            return self._distance(0, customer) + self._distance(customer, 0)
         
         new_route = route.copy()
         new_route.insert(position, customer)
@@ -224,25 +370,24 @@ class VRPAlgorithms:
         routes = []
         visited = [False] * len(self.points)
         visited[0] = True
+        assigned = 0
+        self._start_progress()
         
         # Calculate savings
-        savings = []
-        for i in range(1, len(self.points)):
-            for j in range(i + 1, len(self.points)):
-                saving = self.distance_matrix[0][i] + self.distance_matrix[0][j] - self.distance_matrix[i][j]
-                savings.append((saving, i, j))
-        
-        savings.sort(reverse=True)
+        savings = self._savings()
+        self._report_progress('savings', routes, assigned, force=True)
         
         # Create routes based on savings
         for saving, i, j in savings:
             if not visited[i] and not visited[j]:
                 total_demand = self.points[i]['demand'] + self.points[j]['demand']
-                if total_demand <= self.vehicle_capacity:
+                if total_demand <= self.vehicle_capacity and self._route_feasible([i, j]):
                     route = {'customers': [i, j], 'totalCost': 0, 'totalDemand': total_demand}
                     route['totalCost'] = self._calculate_route_cost(route['customers'])
                     routes.append(route)
                     visited[i] = visited[j] = True
+                    assigned += 2
+                    self._report_progress('construct', routes, assigned)
         
         # Add remaining customers to existing routes or create new routes
         for i in range(1, len(self.points)):
@@ -253,16 +398,9 @@ class VRPAlgorithms:
                 for route in routes:
                     if route['totalDemand'] + self.points[i]['demand'] <= self.vehicle_capacity:
                         # Find best insertion position
-                        best_cost = float('inf')
-                        best_pos = 0
-                        
-                        for pos in range(len(route['customers']) + 1):
-                            new_route = route['customers'].copy()
-                            new_route.insert(pos, i)
-                            cost = self._calculate_route_cost(new_route)
-                            if cost < best_cost:
-                                best_cost = cost
-                                best_pos = pos
+                        best_pos = self._best_insertion_position(route['customers'], i, self._schedule(route['customers']))
+                        if best_pos is None:
+                            continue
                         
                         route['customers'].insert(best_pos, i)
                         route['totalDemand'] += self.points[i]['demand']
@@ -271,42 +409,86 @@ class VRPAlgorithms:
                         break
                 
                 # Create new route if couldn't add to existing
-                if not added and len(routes) < self.num_vehicles:
+                if not added and len(routes) < self.num_vehicles and self._route_feasible([i]):
                     route = {'customers': [i], 'totalCost': 0, 'totalDemand': self.points[i]['demand']}
                     route['totalCost'] = self._calculate_route_cost(route['customers'])
                     routes.append(route)
+                    added = True
+                if added:
+                    assigned += 1
+                    self._report_progress('construct', routes, assigned)
         
+        self._report_progress('done', routes, assigned, force=True)
         return routes
     
+    def _savings(self) -> List[tuple]:
+        """(saving, i, j) for every customer pair, largest saving first"""
+        # Saving of serving j straight after i instead of on separate routes.
+        # With asymmetric costs this depends on direction, so both orders are
+        # considered and the pair route keeps the order it was scored in.
+        savings = []
+        rows = self._rows
+        distance = self._distance
+        symmetric = self.distances.symmetric
+        for i in range(1, len(self.points)):
+            if rows is not None:
+                row, from_depot, to_depot = rows[i], rows[0], rows[i][0]
+                for j in range(i + 1 if symmetric else 1, len(self.points)):
+                    if i != j:
+                        savings.append((to_depot + from_depot[j] - row[j], i, j))
+                continue
+            for j in range(i + 1 if symmetric else 1, len(self.points)):
+                if i == j:
+                    continue
+                saving = distance(i, 0) + distance(0, j) - distance(i, j)
+                savings.append((saving, i, j))
+        
+        savings.sort(reverse=True)
+        return savings
+    
     def nearest_neighbor_algorithm(self):
         """Nearest Neighbor Algorithm"""
         routes = []
-        visited = [False] * len(self.points)
+        demands = np.array([point['demand'] for point in self.points])
+        visited = np.zeros(len(self.points), dtype=bool)
         visited[0] = True
+        assigned = 0
+        self._start_progress()
+        
+        if self.time_windows is not None:
+            ready, due, service = time_window_arrays(self.points)
+            to_depot = self.distances.column(0)
         
         while True:
             current_route = []
             current_demand = 0
             current_vehicle = 0  # Start from depot
             
+            if self.time_windows is not None:
+                current_time = ready[0] + service[0]
+            
             while True:
-                nearest_customer = -1
-                min_distance = float('inf')
-                
-                for i in range(1, len(self.points)):
-                    if not visited[i] and current_demand + self.points[i]['demand'] <= self.vehicle_capacity:
-                        distance = self.distance_matrix[current_vehicle][i]
-                        if distance < min_distance:
-                            min_distance = distance
-                            nearest_customer = i
-                
-                if nearest_customer == -1:
+                # Scan a whole distance row at once for the nearest feasible customer
+                row = self.distances.row(current_vehicle)
+                if self.time_windows is None:
+                    nearest_customer = self._nearest_customer(row, visited, demands, current_demand)
+                else:
+                    # Arrive within the window and still get back to the depot in time
+                    feasible = ~visited & (current_demand + demands <= self.vehicle_capacity)
+                    arrival = current_time + row
+                    feasible &= arrival <= due + TIME_EPSILON
+                    feasible &= np.maximum(arrival, ready) + service + to_depot <= due[0] + TIME_EPSILON
+                    nearest_customer = int(np.argmin(np.where(feasible, row, np.inf))) if feasible.any() else -1
+                if nearest_customer < 0:
                     break
                 
                 current_route.append(nearest_customer)
                 current_demand += self.points[nearest_customer]['demand']
                 visited[nearest_customer] = True
                 current_vehicle = nearest_customer
+                
+                if self.time_windows is not None:
+                    current_time = max(arrival[nearest_customer], ready[nearest_customer]) + service[nearest_customer]
             
             if not current_route:
                 break
@@ -314,5 +496,73 @@ class VRPAlgorithms:
             route = {'customers': current_route, 'totalCost': 0, 'totalDemand': current_demand}
             route['totalCost'] = self._calculate_route_cost(route['customers'])
             routes.append(route)
+            assigned += len(current_route)
+            self._report_progress('construct', routes, assigned)
+        
+        self._report_progress('done', routes, assigned, force=True)
+        return routes
+    
+    def sweep_algorithm(self, improve: bool = True):
+        """Sweep Algorithm: fill vehicles in polar-angle order around the depot
+        
+        Customers are sorted once by angle (then distance) around the depot,
+        so construction is O(n log n) and needs only O(n) distances. Like
+        the other constructors it opens at most `num_vehicles` routes;
+        customers that fit none are left unserved. With `improve` every
+        route is then re-optimised like in the enhanced algorithm.
+        """
+        xs = np.array([point['x'] for point in self.points], dtype=np.float64)
+        ys = np.array([point['y'] for point in self.points], dtype=np.float64)
+        dx, dy = xs[1:] - xs[0], ys[1:] - ys[0]
+        order = np.lexsort((np.hypot(dx, dy), np.arctan2(dy, dx))) + 1
+        
+        depot = None if self.time_windows is None else self.time_windows.node(0)
+        self._start_progress()
+        
+        def fits(segment, route_demand, customer):
+            # Capacity and, with time windows, still back at the depot in time
+            if route_demand + self.points[customer]['demand'] > self.vehicle_capacity:
+                return False
+            if segment is None:
+                return True
+            extended = self.time_windows.concat(segment, self.time_windows.node(customer))
+            return extended.feasible and self.time_windows.concat(extended, depot).feasible
+        
+        routes = []
+        current_route = []
+        current_demand = 0
+        segment = depot
+        
+        for customer in order.tolist():
+            if not fits(segment, current_demand, customer):
+                if not current_route or not fits(depot, 0, customer):
+                    continue  # Cannot be served even by an empty vehicle
+                if len(routes) + 1 >= self.num_vehicles:
+                    continue  # Every vehicle is in use; try the next customer on this one
+                routes.append({'customers': current_route, 'totalCost': 0, 'totalDemand': current_demand})
+                current_route = []
+                current_demand = 0
+                segment = depot
+            
+            current_route.append(customer)
+            current_demand += self.points[customer]['demand']
+            if segment is not None:
+                segment = self.time_windows.concat(segment, self.time_windows.node(customer))
+        
+        if current_route:
+            routes.append({'customers': current_route, 'totalCost': 0, 'totalDemand': current_demand})
+        
+        for route in routes:
+            route['totalCost'] = self._calculate_route_cost(route['customers'])
+        assigned = sum(len(route['customers']) for route in routes)
+        self._report_progress('construct', routes, assigned, force=True)
+        
+        if improve:
+            for route in routes:
+                if len(route['customers']) > 2:
+                    route['customers'] = self._optimize_route(route['customers'])
+                    route['totalCost'] = self._calculate_route_cost(route['customers'])
+                    self._report_progress('improve', routes, assigned)
         
+        self._report_progress('done', routes, assigned, force=True)
         return routes 
\ No newline at end of file
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+
+import math
+import os
+from collections import OrderedDict
+from typing import List, Dict
+
+import numpy as np
+
+
+class DistanceOracle:
+    """Common interface for looking up distances between problem points
+
+    Algorithms only ever ask an oracle for single distances, whole rows or
+    columns, blocks, or vectorised pair lookups, so the dense matrix is just
+    one way of answering those queries.
+    """
+
+    symmetric = True
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def distance(self, i: int, j: int) -> float:
+        """Distance from point i to point j"""
+        raise NotImplementedError
+
+    def row(self, i: int) -> np.ndarray:
+        """Distances from point i to every point"""
+        raise NotImplementedError
+
+    def column(self, j: int) -> np.ndarray:
+        """Distances from every point to point j"""
+        if self.symmetric:
+            return self.row(j)
+        raise NotImplementedError
+
+    def block(self, rows, cols) -> np.ndarray:
+        """Distances between each of `rows` and each of `cols`"""
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        return np.stack([self.row(i)[cols] for i in rows]) if len(rows) else np.empty((0, len(cols)))
+
+    def pairs(self, rows, cols) -> np.ndarray:
+        """Element-wise distances from rows[k] to cols[k]"""
+        raise NotImplementedError
+
+    def memory_bytes(self) -> int:
+        """Approximate number of bytes held by the oracle"""
+        raise NotImplementedError
+
+
+class DenseDistanceMatrix(DistanceOracle):
+    """Precomputed n x n distance matrix
+
+    The matrix may be any 2-D array, including a read-only numpy.memmap of
+    an external (possibly asymmetric) matrix; `source` then records the
+    (filename, byte offset) of its float64 data so that other processes can
+    map the same file instead of receiving a copy.
+    """
+
+    def __init__(self, matrix, symmetric: bool = True, source=None):
+        self.matrix = matrix if isinstance(matrix, np.ndarray) else np.asarray(matrix, dtype=np.float64)
+        self.symmetric = symmetric
+        self.source = source
+
+    @classmethod
+    def from_points(cls, points: List[Dict]):
+        """Build the full Euclidean matrix for a list of point dicts"""
+        xs, ys = _coordinates(points)
+        dx = xs[:, None] - xs[None, :]
+        dy = ys[:, None] - ys[None, :]
+        return cls(np.sqrt(dx * dx + dy * dy))
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def distance(self, i: int, j: int) -> float:
+        return self.matrix.item(i, j)
+
+    def row(self, i: int) -> np.ndarray:
+        return self.matrix[i]
+
+    def column(self, j: int) -> np.ndarray:
+        return self.matrix[:, j]
+
+    def block(self, rows, cols) -> np.ndarray:
+        return self.matrix[np.ix_(np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp))]
+
+    def pairs(self, rows, cols) -> np.ndarray:
+        return self.matrix[np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)]
+
+    def memory_bytes(self) -> int:
+        return self.matrix.nbytes
+
+
+class EuclideanDistanceOracle(DistanceOracle):
+    """Matrix-free Euclidean distances computed on demand from coordinates
+
+    Rows are computed with NumPy and, when `cache_rows` is positive, the most
+    recently used rows are kept in a bounded LRU cache. Memory use is
+    therefore O(n * cache_rows) instead of O(n^2). `hits` and `misses`
+    count the row() lookups served from and added to the cache.
+    """
+
+    def __init__(self, xs, ys, cache_rows: int = 0):
+        self.xs = np.asarray(xs, dtype=np.float64)
+        self.ys = np.asarray(ys, dtype=np.float64)
+        self.cache_rows = max(0, int(cache_rows))
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_points(cls, points: List[Dict], cache_rows: int = 0):
+        xs, ys = _coordinates(points)
+        return cls(xs, ys, cache_rows=cache_rows)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def distance(self, i: int, j: int) -> float:
+        cached = self._cache.get(i)
+        if cached is not None:
+            self._cache.move_to_end(i)
+            return cached.item(j)
+        dx = self.xs.item(i) - self.xs.item(j)
+        dy = self.ys.item(i) - self.ys.item(j)
+        return math.sqrt(dx * dx + dy * dy)
+
+    def row(self, i: int) -> np.ndarray:
+        cached = self._cache.get(i)
+        if cached is not None:
+            self.hits += 1
+            self._cache.move_to_end(i)
+            return cached
+        self.misses += 1
+        dx = self.xs[i] - self.xs
+        dy = self.ys[i] - self.ys
+        values = np.sqrt(dx * dx + dy * dy)
+        if self.cache_rows:
+            values.flags.writeable = False
+            self._cache[i] = values
+            if len(self._cache) > self.cache_rows:
+                self._cache.popitem(last=False)
+        return values
+
+    def block(self, rows, cols) -> np.ndarray:
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        dx = self.xs[rows][:, None] - self.xs[cols][None, :]
+        dy = self.ys[rows][:, None] - self.ys[cols][None, :]
+        return np.sqrt(dx * dx + dy * dy)
+
+    def pairs(self, rows, cols) -> np.ndarray:
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        dx = self.xs[rows] - self.xs[cols]
+        dy = self.ys[rows] - self.ys[cols]
+        return np.sqrt(dx * dx + dy * dy)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def memory_bytes(self) -> int:
+        return self.xs.nbytes + self.ys.nbytes + sum(row.nbytes for row in self._cache.values())
+
+
+def load_distance_matrix(path: str, num_points: int = None, dtype=np.float64,
+                         symmetric: bool = False) -> DenseDistanceMatrix:
+    """Memory-map an external n x n distance matrix without reading it into RAM
+
+    `path` is either a .npy file or a raw row-major binary file of `dtype`
+    values; for raw files `num_points` defaults to the square root of the
+    element count. Road-network matrices are usually asymmetric, so
+    `symmetric` defaults to False.
+    """
+    if path.endswith('.npy'):
+        matrix = np.load(path, mmap_mode='r')
+    else:
+        itemsize = np.dtype(dtype).itemsize
+        if num_points is None:
+            num_points = math.isqrt(os.path.getsize(path) // itemsize)
+        matrix = np.memmap(path, dtype=dtype, mode='r', shape=(num_points, num_points))
+
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError(f"Distance matrix in {path} is not square: {matrix.shape}")
+
+    # Only native float64 C-order data can be shared with the C++ solver as is
+    source = None
+    if matrix.dtype == np.dtype('<f8') and matrix.flags.c_contiguous:
+        source = (os.path.abspath(path), matrix.offset)
+    return DenseDistanceMatrix(matrix, symmetric=symmetric, source=source)
+
+
+def build_distance_oracle(points: List[Dict], mode: str = 'dense', cache_rows: int = 0) -> DistanceOracle:
+    """Create a distance oracle for the given points
+
+    `mode` is 'dense' for a precomputed matrix or 'euclidean' for on-demand
+    computation with an optional LRU row cache of `cache_rows` rows.
+    """
+    if mode == 'dense':
+        return DenseDistanceMatrix.from_points(points)
+    if mode == 'euclidean':
+        return EuclideanDistanceOracle.from_points(points, cache_rows=cache_rows)
+    raise ValueError(f"Unknown distance mode: {mode}")
+
+
+def _coordinates(points: List[Dict]):
+    xs = np.fromiter((point['x'] for point in points), dtype=np.float64, count=len(points))
+    ys = np.fromiter((point['y'] for point in points), dtype=np.float64, count=len(points))
+    return xs, ys
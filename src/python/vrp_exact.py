@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List
+
+import numpy as np
+
+# Routes with at most this many customers are solved exactly by default;
+# Held-Karp needs O(2^k * k^2) time and O(2^k * k) memory. Uncached it is
+# several times slower than 2-opt from about 9 customers on (5 ms against
+# 1 ms at 12), so larger routes only go exact when asked for
+EXACT_ROUTE_SIZE = 8
+
+# Optimal orders remembered across routes and runs, keyed by the distance
+# block of the (sorted) stop set. Shared by every thread, so each lookup and
+# update holds the lock
+EXACT_CACHE_SIZE = 4096
+_exact_cache = OrderedDict()
+_exact_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _masks_by_size(k: int):
+    """Subset bitmasks of k elements grouped by how many bits they set"""
+    masks = np.arange(1 << k, dtype=np.int64)
+    sizes = np.zeros(1 << k, dtype=np.int64)
+    for bit in range(k):
+        sizes += (masks >> bit) & 1
+    return [masks[sizes == size] for size in range(k + 1)]
+
+
+def held_karp(block: np.ndarray) -> List[int]:
+    """Optimal visiting order for a depot + k customers distance block
+
+    block[0] is the depot and block[1:] the customers; the returned order
+    lists customer positions 1..k. Each DP layer (all subsets of one size)
+    is computed with a single vectorised NumPy step.
+    """
+    k = block.shape[0] - 1
+    if k <= 1:
+        return list(range(1, k + 1))
+
+    between = block[1:, 1:]
+    bits = np.int64(1) << np.arange(k, dtype=np.int64)
+    cost = np.full((1 << k, k), np.inf)
+    parent = np.full((1 << k, k), -1, dtype=np.int64)
+    cost[bits, np.arange(k)] = block[0, 1:]
+
+    for masks in _masks_by_size(k)[2:]:
+        # For every subset and last customer j in it: best predecessor i
+        previous = masks[:, None] ^ bits[None, :]
+        contains = (masks[:, None] & bits[None, :]) != 0
+        candidates = cost[previous] + between.T[None, :, :]
+        best = np.argmin(candidates, axis=2)
+        best_cost = np.take_along_axis(candidates, best[:, :, None], axis=2)[:, :, 0]
+        rows, lasts = np.nonzero(contains)
+        cost[masks[rows], lasts] = best_cost[rows, lasts]
+        parent[masks[rows], lasts] = best[rows, lasts]
+
+    full = (1 << k) - 1
+    last = int(np.argmin(cost[full] + block[1:, 0]))
+    order = []
+    mask = full
+    while last >= 0:
+        order.append(last + 1)
+        previous_last = int(parent[mask, last])
+        mask ^= 1 << last
+        last = previous_last
+    order.reverse()
+    return order
+
+
+def optimal_route(distances, route: List[int]) -> List[int]:
+    """Exact minimum-cost order of a route's customers (depot at both ends)
+
+    Results are memoised per stop set and distance block, so a stop set that
+    was already optimised (in this or an earlier solve) costs one lookup.
+    """
+    stops = sorted(route)
+    nodes = [0] + stops
+    block = np.ascontiguousarray(distances.block(nodes, nodes), dtype=np.float64)
+    key = block.tobytes()
+
+    with _exact_cache_lock:
+        order = _exact_cache.get(key)
+        if order is not None:
+            _exact_cache.move_to_end(key)
+    if order is None:
+        # Solved outside the lock; a concurrent solve of the same block
+        # stores the same order
+        order = held_karp(block)
+        with _exact_cache_lock:
+            _exact_cache[key] = order
+            if len(_exact_cache) > EXACT_CACHE_SIZE:
+                _exact_cache.popitem(last=False)
+
+    return [stops[position - 1] for position in order]
+
+
+def clear_exact_cache():
+    with _exact_cache_lock:
+        _exact_cache.clear()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+import importlib.util
+from typing import List, Dict
+
+import numpy as np
+
+from vrp_distance import DistanceOracle, EuclideanDistanceOracle
+from vrp_verify import flatten_routes, leg_distances
+from vrp_time_windows import READY_TIME, DUE_TIME, SERVICE_TIME, has_time_windows, time_window_arrays
+
+# Point dict keys stored as problem columns
+PROBLEM_FIELDS = ['x', 'y', 'demand']
+TIME_WINDOW_FIELDS = [READY_TIME, DUE_TIME, SERVICE_TIME]
+
+
+def problem_columns(points: List[Dict]) -> Dict[str, np.ndarray]:
+    """Problem points as columns (point_id, x, y, demand and any time windows)"""
+    columns = {'point_id': np.arange(len(points), dtype=np.int64)}
+    for field in PROBLEM_FIELDS:
+        columns[field] = np.array([point[field] for point in points])
+    if has_time_windows(points):
+        columns.update(zip(TIME_WINDOW_FIELDS, time_window_arrays(points)))
+    return columns
+
+
+def _per_route_cumsum(values: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Running total of `values` that restarts at the beginning of every route"""
+    totals = np.cumsum(values)
+    nonempty = lengths > 0
+    offsets = np.zeros(len(lengths), dtype=totals.dtype)
+    offsets[nonempty] = totals[starts[nonempty]] - values[starts[nonempty]]
+    return totals - np.repeat(offsets, lengths)
+
+
+def solution_columns(points: List[Dict], routes: List[Dict], distances: DistanceOracle = None) -> Dict[str, np.ndarray]:
+    """One row per visited stop: route_id, stop_sequence, customer, cumulative_load, cumulative_distance
+
+    cumulative_distance is the distance travelled from the depot up to and
+    including the arrival at the stop.
+    """
+    distances = distances if distances is not None else EuclideanDistanceOracle.from_points(points)
+    demands = np.array([point['demand'] for point in points])
+
+    stops, route_ids, starts, lengths = flatten_routes(routes)
+    legs, _ = leg_distances(distances, stops, starts, lengths)
+
+    return {
+        'route_id': route_ids,
+        'stop_sequence': np.arange(len(stops), dtype=np.int64) - np.repeat(starts, lengths),
+        'customer': stops,
+        'cumulative_load': _per_route_cumsum(demands[stops], starts, lengths),
+        'cumulative_distance': _per_route_cumsum(legs, starts, lengths),
+    }
+
+
+def route_columns(routes: List[Dict]) -> Dict[str, np.ndarray]:
+    """One row per route: route_id, num_stops, total_cost, total_demand"""
+    return {
+        'route_id': np.arange(len(routes), dtype=np.int64),
+        'num_stops': np.array([len(route['customers']) for route in routes], dtype=np.int64),
+        'total_cost': np.array([route['totalCost'] for route in routes], dtype=np.float64),
+        'total_demand': np.array([route['totalDemand'] for route in routes]),
+    }
+
+
+def batch_columns(points: List[Dict], solutions: Dict[str, List[Dict]], distances: DistanceOracle = None):
+    """Stop and route columns for many solutions of one problem at once
+
+    Every row gets a `solution_id` indexing into the returned list of
+    solution names. Returns (names, stop_columns, route_columns).
+    """
+    distances = distances if distances is not None else EuclideanDistanceOracle.from_points(points)
+    names = list(solutions)
+    all_routes = [route for name in names for route in solutions[name]]
+    route_counts = np.array([len(solutions[name]) for name in names], dtype=np.int64)
+    route_solution = np.repeat(np.arange(len(names), dtype=np.int64), route_counts)
+
+    stops = solution_columns(points, all_routes, distances)
+    routes = route_columns(all_routes)
+
+    # Renumber routes from zero within each solution
+    route_offset = np.repeat(np.cumsum(route_counts) - route_counts, route_counts)
+    stops['solution_id'] = route_solution[stops['route_id']]
+    stops['route_id'] = stops['route_id'] - route_offset[stops['route_id']]
+    routes['solution_id'] = route_solution
+    routes['route_id'] = routes['route_id'] - route_offset
+    return names, stops, routes
+
+
+def export_npz(file, points: List[Dict], vehicle_capacity: int, num_vehicles: int,
+               solutions: Dict[str, List[Dict]], distances: DistanceOracle = None):
+    """Write a problem and any number of its solutions to a compressed .npz file
+
+    `file` may be a path or a binary file object.
+    """
+    names, stops, routes = batch_columns(points, solutions, distances)
+    arrays = {'vehicle_capacity': np.array(vehicle_capacity), 'num_vehicles': np.array(num_vehicles),
+              'solution_names': np.array(names, dtype=str)}
+    arrays.update({f"problem_{key}": value for key, value in problem_columns(points).items()})
+    arrays.update({f"stops_{key}": value for key, value in stops.items()})
+    arrays.update({f"routes_{key}": value for key, value in routes.items()})
+    np.savez_compressed(file, **arrays)
+
+
+def load_npz(file) -> Dict:
+    """Read a file written by export_npz back into points and route dicts"""
+    with np.load(file) as data:
+        # NpzFile decompresses on every access, so pull each column out once
+        fields = [field for field in PROBLEM_FIELDS + TIME_WINDOW_FIELDS if f"problem_{field}" in data]
+        columns = [data[f"problem_{field}"].tolist() for field in fields]
+        points = [dict(zip(fields, values)) for values in zip(*columns)]
+        names = data['solution_names'].tolist()
+        solutions = {name: [] for name in names}
+
+        # Routes and stops are stored in solution order, so customers can be
+        # sliced off the stop array route by route
+        customers = data['stops_customer'].tolist()
+        offset = 0
+        for solution_id, num_stops, total_cost, total_demand in zip(
+                data['routes_solution_id'].tolist(), data['routes_num_stops'].tolist(),
+                data['routes_total_cost'].tolist(), data['routes_total_demand'].tolist()):
+            solutions[names[solution_id]].append({
+                'customers': customers[offset:offset + num_stops],
+                'totalCost': total_cost,
+                'totalDemand': total_demand
+            })
+            offset += num_stops
+
+        return {
+            'points': points,
+            'vehicle_capacity': data['vehicle_capacity'].item(),
+            'num_vehicles': data['num_vehicles'].item(),
+            'solutions': solutions,
+        }
+
+
+def parquet_available() -> bool:
+    """Whether pandas has a Parquet engine (pyarrow or fastparquet) to use"""
+    if importlib.util.find_spec('pandas') is None:
+        return False
+    return any(importlib.util.find_spec(engine) is not None for engine in ('pyarrow', 'fastparquet'))
+
+
+def export_table(path: str, columns: Dict[str, np.ndarray]):
+    """Write a column dict as a Parquet (.parquet) or Arrow/Feather (.arrow, .feather) file"""
+    if path.endswith('.parquet'):
+        if not parquet_available():
+            raise ImportError("Parquet export needs pandas with pyarrow or fastparquet installed")
+    elif path.endswith(('.arrow', '.feather')):
+        if importlib.util.find_spec('pandas') is None or importlib.util.find_spec('pyarrow') is None:
+            raise ImportError("Arrow export needs pandas with pyarrow installed")
+    else:
+        raise ValueError(f"Unsupported table format: {path}")
+
+    import pandas as pd
+    frame = pd.DataFrame(columns, copy=False)
+    if path.endswith('.parquet'):
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_feather(path)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from itertools import chain
+from typing import List, Dict
+
+import numpy as np
+
+from vrp_algorithms import VRPAlgorithms
+from vrp_distance import DistanceOracle, DenseDistanceMatrix, _coordinates
+
+# Numba is optional: without it the kernels below are plain Python functions
+# (same results, no speed-up) and the wrapper keeps using VRPAlgorithms
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+
+# Python solves of at least this many points are worth loading the kernels
+# for (~0.3 s from Numba's on-disk cache, seconds on the very first compile);
+# smaller ones only use them once they are warm
+JIT_MIN_POINTS = 500
+
+_warm = False
+_warm_lock = threading.Lock()
+
+# The kernels add up costs in exactly the order VRPAlgorithms does, so every
+# comparison (and therefore every route) comes out identical.
+
+@njit(cache=True)
+def distance_matrix(xs, ys):
+    n = len(xs)
+    matrix = np.empty((n, n))
+    for i in range(n):
+        for j in range(n):
+            dx = xs[i] - xs[j]
+            dy = ys[i] - ys[j]
+            matrix[i, j] = np.sqrt(dx * dx + dy * dy)
+    return matrix
+
+
+@njit(cache=True)
+def route_cost(matrix, route):
+    cost = 0.0
+    last = 0
+    for customer in route:
+        cost += matrix[last, customer]
+        last = customer
+    return cost + matrix[last, 0]
+
+
+@njit(cache=True)
+def inserted_route_cost(matrix, route, customer, position):
+    """Cost of `route` with `customer` inserted before `position`, without copying"""
+    cost = 0.0
+    last = 0
+    for k in range(len(route) + 1):
+        if k < position:
+            node = route[k]
+        elif k == position:
+            node = customer
+        else:
+            node = route[k - 1]
+        cost += matrix[last, node]
+        last = node
+    return cost + matrix[last, 0]
+
+
+@njit(cache=True)
+def reversed_route_cost(matrix, route, start, end):
+    """Cost of `route` with route[start:end] reversed, without copying"""
+    cost = 0.0
+    last = 0
+    for k in range(len(route)):
+        node = route[start + end - 1 - k] if start <= k < end else route[k]
+        cost += matrix[last, node]
+        last = node
+    return cost + matrix[last, 0]
+
+
+@njit(cache=True)
+def best_insertion(matrix, route, customer):
+    best_cost = np.inf
+    best_position = -1
+    for position in range(len(route) + 1):
+        cost = inserted_route_cost(matrix, route, customer, position)
+        if cost < best_cost:
+            best_cost = cost
+            best_position = position
+    return best_position
+
+
+@njit(cache=True)
+def insertion_score(matrix, route, customer, demand, route_demand, vehicle_capacity):
+    """VRPAlgorithms._calculate_advanced_score for a non-empty route"""
+    best_score = -1.0
+    for position in range(len(route) + 1):
+        insertion_cost = inserted_route_cost(matrix, route, customer, position)
+        demand_ratio = demand / vehicle_capacity
+
+        route_length_penalty = 1.0
+        if len(route) >= 5:
+            route_length_penalty = 0.6
+        elif len(route) >= 4:
+            route_length_penalty = 0.8
+        elif len(route) >= 3:
+            route_length_penalty = 0.9
+
+        capacity_ratio = (route_demand + demand) / vehicle_capacity
+        balance_factor = 1.0 - abs(capacity_ratio - 0.7)
+
+        distance_factor = 1.0 / (insertion_cost + 1.0)
+        demand_efficiency = 1.0 + 1.0 * demand_ratio
+
+        score = distance_factor * demand_efficiency * route_length_penalty * balance_factor
+        if score > best_score:
+            best_score = score
+    return best_score
+
+
+@njit(cache=True)
+def best_route_assignment(matrix, customers, starts, lengths, route_demands, demands, visited, vehicle_capacity):
+    """VRPAlgorithms._best_route_assignment over routes flattened into one array"""
+    best_score = -1.0
+    best_customer = -1
+    best_route = -1
+    for customer in range(1, len(demands)):
+        if visited[customer]:
+            continue
+        for r in range(len(starts)):
+            if route_demands[r] + demands[customer] > vehicle_capacity:
+                continue
+            route = customers[starts[r]:starts[r] + lengths[r]]
+            score = insertion_score(matrix, route, customer, demands[customer], route_demands[r], vehicle_capacity)
+            if score > best_score:
+                best_score = score
+                best_customer = customer
+                best_route = r
+    return best_score, best_customer, best_route
+
+
+@njit(cache=True)
+def two_opt(matrix, route):
+    """First-improvement 2-opt as in VRPAlgorithms; returns (route, moves applied)"""
+    route = route.copy()
+    n = len(route)
+    best_cost = route_cost(matrix, route)
+    moves = 0
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 1):
+            for j in range(i + 2, n):
+                cost = reversed_route_cost(matrix, route, i, j)
+                if cost < best_cost:
+                    route[i:j] = route[i:j][::-1].copy()
+                    best_cost = cost
+                    moves += 1
+                    improved = True
+                    break
+            if improved:
+                break
+    return route, moves
+
+
+@njit(cache=True)
+def savings(matrix, symmetric):
+    """Clarke-Wright savings as parallel (saving, i, j) arrays, unsorted"""
+    n = matrix.shape[0]
+    count = (n - 1) * (n - 2) // 2 if symmetric else (n - 1) * (n - 2)
+    values = np.empty(count)
+    firsts = np.empty(count, dtype=np.int64)
+    seconds = np.empty(count, dtype=np.int64)
+    k = 0
+    for i in range(1, n):
+        for j in range(i + 1 if symmetric else 1, n):
+            if i == j:
+                continue
+            values[k] = matrix[i, 0] + matrix[0, j] - matrix[i, j]
+            firsts[k] = i
+            seconds[k] = j
+            k += 1
+    return values, firsts, seconds
+
+
+@njit(cache=True)
+def nearest_feasible(row, visited, demands, current_demand, vehicle_capacity):
+    """Index of the nearest unvisited customer that still fits, or -1"""
+    nearest = -1
+    nearest_distance = np.inf
+    for customer in range(len(row)):
+        if visited[customer] or current_demand + demands[customer] > vehicle_capacity:
+            continue
+        if row[customer] < nearest_distance:
+            nearest = customer
+            nearest_distance = row[customer]
+    return nearest
+
+
+class JitVRPAlgorithms(VRPAlgorithms):
+    """VRPAlgorithms with its hot loops compiled by Numba
+
+    Produces exactly the same routes as VRPAlgorithms. The route kernels
+    need the distances as an array, so with on-demand oracles or time
+    windows the interpreted methods are used for them.
+    """
+
+    def __init__(self, points: List[Dict], vehicle_capacity: int, num_vehicles: int,
+                 distances: DistanceOracle = None, **kwargs):
+        if distances is None:
+            distances = DenseDistanceMatrix(distance_matrix(*_coordinates(points)))
+        super().__init__(points, vehicle_capacity, num_vehicles, distances, **kwargs)
+        # np.asarray drops the np.memmap subclass without copying
+        self._matrix = np.asarray(distances.matrix) if isinstance(distances, DenseDistanceMatrix) else None
+        self._route_kernels = self._matrix is not None and self.time_windows is None
+        self._demands = np.array([point['demand'] for point in points])
+
+    def _calculate_route_cost(self, route: List[int]) -> float:
+        if self._matrix is None or not route:
+            return super()._calculate_route_cost(route)
+        return float(route_cost(self._matrix, np.asarray(route, dtype=np.int64)))
+
+    def _best_route_assignment(self, routes: List[Dict], schedules: List, visited: List[bool]):
+        if not self._route_kernels or not all(route['customers'] for route in routes):
+            return super()._best_route_assignment(routes, schedules, visited)
+        lengths = np.array([len(route['customers']) for route in routes], dtype=np.int64)
+        customers = np.fromiter(chain.from_iterable(route['customers'] for route in routes), dtype=np.int64,
+                                count=int(lengths.sum()))
+        score, customer, route_index = best_route_assignment(
+            self._matrix, customers, np.cumsum(lengths) - lengths, lengths,
+            np.array([route['totalDemand'] for route in routes]), self._demands,
+            np.array(visited, dtype=np.bool_), self.vehicle_capacity)
+        return float(score), int(customer), int(route_index)
+
+    def _calculate_advanced_score(self, customer: int, route: Dict, schedule=None) -> float:
+        if not self._route_kernels or not route['customers']:
+            return super()._calculate_advanced_score(customer, route, schedule)
+        return float(insertion_score(self._matrix, np.asarray(route['customers'], dtype=np.int64), customer,
+                                     self.points[customer]['demand'], route['totalDemand'], self.vehicle_capacity))
+
+    def _best_insertion_position(self, route: List[int], customer: int, schedule=None):
+        if not self._route_kernels:
+            return super()._best_insertion_position(route, customer, schedule)
+        position = best_insertion(self._matrix, np.asarray(route, dtype=np.int64), customer)
+        return None if position < 0 else int(position)
+
+    def _optimize_route_2opt(self, route: List[int]) -> List[int]:
+        if not self._route_kernels or len(route) < 3:
+            return super()._optimize_route_2opt(route)
+        optimized, moves = two_opt(self._matrix, np.asarray(route, dtype=np.int64))
+        self.moves_applied += moves
+        return optimized.tolist()
+
+    def _savings(self) -> List[tuple]:
+        if self._matrix is None:
+            return super()._savings()
+        values, firsts, seconds = savings(self._matrix, self.distances.symmetric)
+        # Same order as sorting the tuples in reverse: (saving, i, j) descending
+        order = np.lexsort((seconds, firsts, values))[::-1]
+        return list(zip(values[order].tolist(), firsts[order].tolist(), seconds[order].tolist()))
+
+    def _nearest_customer(self, row, visited, demands, current_demand) -> int:
+        return int(nearest_feasible(row, visited, demands, current_demand, self.vehicle_capacity))
+
+
+def is_warm() -> bool:
+    """Whether the kernels are already compiled in this process"""
+    return _warm
+
+
+def warm_up() -> float:
+    """Compile (or load from Numba's cache) every kernel once; returns the seconds it took
+
+    Solving a tiny instance with every algorithm covers all kernels for
+    integer demands and capacity. Later calls return 0 immediately.
+    """
+    global _warm
+    with _warm_lock:
+        if _warm:
+            return 0.0
+        start = time.perf_counter()
+        points = [{'x': float(i % 3), 'y': float(i // 3), 'demand': 0 if i == 0 else 1} for i in range(9)]
+        solver = JitVRPAlgorithms(points, 4, len(points), exact_route_size=0)
+        solver.enhanced_custom_algorithm()
+        solver.clarke_wright_algorithm()
+        solver.nearest_neighbor_algorithm()
+        _warm = True
+        return time.perf_counter() - start
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import json
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict
+
+import numpy as np
+
+from vrp_wrapper import CppVRPWrapper, PYTHON_ALGORITHMS
+from vrp_portfolio import random_instance
+
+PERCENTILES = (50, 95, 99)
+
+
+def load_request_log(path: str) -> List[Dict]:
+    """Read a JSONL request log
+
+    Each line is one solve request: {"points": [...], "vehicleCapacity": int,
+    "numVehicles": int} with an optional "algorithm" (default 'enhanced').
+    """
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def record_request(path: str, points: List[Dict], vehicle_capacity: int, num_vehicles: int,
+                   algorithm: str = 'enhanced'):
+    """Append one solve request to a JSONL request log"""
+    with open(path, 'a') as f:
+        f.write(json.dumps({'algorithm': algorithm, 'points': points,
+                            'vehicleCapacity': vehicle_capacity, 'numVehicles': num_vehicles}) + '\n')
+
+
+def generate_request_log(path: str, count: int, sizes=(20, 50, 100, 200), algorithms=('enhanced',),
+                         vehicle_capacity: int = 30, seed: int = 0):
+    """Write `count` random requests (sizes and algorithms drawn uniformly) to a new log
+
+    The fleet is never the limiting factor (one vehicle per customer).
+    """
+    rng = random.Random(seed)
+    if os.path.exists(path):
+        os.unlink(path)
+    for index in range(count):
+        n = rng.choice(sizes)
+        record_request(path, random_instance(n, vehicle_capacity, seed=seed + index), vehicle_capacity, n,
+                       rng.choice(algorithms))
+
+
+def arrival_offsets(count: int, rate: float = None, arrival: str = 'poisson', seed: int = 0) -> np.ndarray:
+    """Seconds after the start at which each request arrives
+
+    Without a rate every request arrives at once (closed loop: the pool is
+    kept saturated); otherwise arrivals are open loop at `rate` requests per
+    second, either evenly spaced ('uniform') or as a Poisson process.
+    """
+    if not rate:
+        return np.zeros(count)
+    if arrival == 'uniform':
+        return np.arange(count) / rate
+    gaps = np.random.default_rng(seed).exponential(1.0 / rate, count)
+    return np.cumsum(gaps) - gaps[0]
+
+
+def summarize(values) -> Dict:
+    """p50/p95/p99, mean and max of a list of seconds (None when empty)"""
+    if not len(values):
+        return None
+    values = np.asarray(values, dtype=np.float64)
+    summary = {f"p{p}": float(np.percentile(values, p)) for p in PERCENTILES}
+    summary['mean'] = float(values.mean())
+    summary['max'] = float(values.max())
+    return summary
+
+
+def run_load_test(requests: List[Dict], backend: str = 'auto', concurrency: int = 4, rate: float = None,
+                  arrival: str = 'poisson', algorithm: str = None, executable: str = None,
+                  seed: int = 0) -> Dict:
+    """Replay `requests` against the wrapper and measure how it copes
+
+    Requests are submitted at their arrival times to a pool of `concurrency`
+    worker threads, each with its own CppVRPWrapper (wrappers keep per-call
+    state such as `last_backend`). The wrappers are built before the clock
+    starts, so probing (or rebuilding) the solver binary is not measured.
+    Latency runs from arrival to completion,
+    so it includes queueing; service time only covers the solve itself.
+    A request counts as a fallback when its C++ solve failed and was re-run
+    in Python, and as a downgrade when admission control changed it.
+    """
+    local = threading.local()
+    wrappers = queue.Queue()
+
+    def wrapper():
+        # Each worker thread takes one of the pre-built wrappers on first use
+        if not hasattr(local, 'wrapper'):
+            local.wrapper = wrappers.get_nowait()
+        return local.wrapper
+
+    def solve(index, request, arrived):
+        started = time.perf_counter()
+        result = {'index': index, 'algorithm': algorithm or request.get('algorithm', 'enhanced'),
+                  'numPoints': len(request['points']), 'error': None}
+        try:
+            solver = wrapper()
+            solver.run(result['algorithm'], request['points'], request['vehicleCapacity'],
+                       request['numVehicles'], backend=backend)
+            result['backend'] = solver.last_backend
+            result['fallback'] = solver.last_fallback
+            result['downgraded'] = solver.last_plan['decision'] == 'downgrade'
+            result['timedOut'] = solver.last_timed_out
+            result['feasible'] = solver.last_verification is None or solver.last_verification['feasible']
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        finished = time.perf_counter()
+        result['latency'] = finished - arrived
+        result['serviceTime'] = finished - started
+        return result
+
+    offsets = arrival_offsets(len(requests), rate, arrival, seed)
+    # The wrapper logs every solve; keep the report readable
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(concurrency):
+            solver = CppVRPWrapper()
+            if executable:
+                solver.cpp_executable = executable
+            wrappers.put(solver)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            start = time.perf_counter()
+            futures = []
+            for index, (request, offset) in enumerate(zip(requests, offsets)):
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(pool.submit(solve, index, request, start + offset))
+            results = [future.result() for future in futures]
+            duration = time.perf_counter() - start
+
+    completed = [result for result in results if result['error'] is None]
+    count = len(results)
+
+    def rate_of(key):
+        return sum(1 for result in completed if result[key]) / count if count else 0.0
+
+    return {
+        'requests': count,
+        'concurrency': concurrency,
+        'arrivalRate': rate,
+        'backend': backend,
+        'duration': duration,
+        'throughput': len(completed) / duration if duration > 0 else 0.0,
+        'latency': summarize([result['latency'] for result in completed]),
+        'serviceTime': summarize([result['serviceTime'] for result in completed]),
+        'errorRate': (count - len(completed)) / count if count else 0.0,
+        'fallbackRate': rate_of('fallback'),
+        'downgradeRate': rate_of('downgraded'),
+        'timeoutRate': rate_of('timedOut'),
+        'infeasibleRate': sum(1 for result in completed if not result['feasible']) / count if count else 0.0,
+        'errors': sorted({result['error'] for result in results if result['error']}),
+        'results': results,
+    }
+
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"Requests: {report['requests']} on backend '{report['backend']}' with concurrency {report['concurrency']}"
+        + (f" at {report['arrivalRate']:g} req/s" if report['arrivalRate'] else " (closed loop)"),
+        f"Duration: {report['duration']:.2f} s, throughput: {report['throughput']:.2f} req/s",
+    ]
+    for key, label in (('latency', 'Latency'), ('serviceTime', 'Service time')):
+        summary = report[key]
+        if summary:
+            lines.append(f"{label}: " + ", ".join(f"p{p} {summary[f'p{p}'] * 1000:.1f} ms" for p in PERCENTILES)
+                         + f", max {summary['max'] * 1000:.1f} ms")
+    lines.append(f"Errors: {report['errorRate']:.1%}, fallbacks: {report['fallbackRate']:.1%}, "
+                 f"downgrades: {report['downgradeRate']:.1%}, timeouts: {report['timeoutRate']:.1%}, "
+                 f"infeasible: {report['infeasibleRate']:.1%}")
+    lines.extend(f"  {error}" for error in report['errors'])
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a JSONL request log against CppVRPWrapper")
+    parser.add_argument('log', help="JSONL request log (one instance per line)")
+    parser.add_argument('--backend', default='auto', choices=['auto', 'cpp', 'python'])
+    parser.add_argument('--concurrency', type=int, default=4, help="worker threads")
+    parser.add_argument('--rate', type=float, default=None, help="arrival rate in requests/s (default: all at once)")
+    parser.add_argument('--arrival', default='poisson', choices=['poisson', 'uniform'])
+    parser.add_argument('--algorithm', choices=sorted(PYTHON_ALGORITHMS), help="override every request's algorithm")
+    parser.add_argument('--repeat', type=int, default=1, help="replay the log this many times")
+    parser.add_argument('--executable', help="C++ solver to use instead of the bundled one")
+    parser.add_argument('--generate', type=int, metavar='COUNT', help="first write COUNT random requests to the log")
+    parser.add_argument('--output', help="write per-request results as JSONL")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_request_log(args.log, args.generate, seed=args.seed)
+
+    requests = load_request_log(args.log) * args.repeat
+    report = run_load_test(requests, args.backend, args.concurrency, args.rate, args.arrival,
+                           args.algorithm, args.executable, args.seed)
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            for result in report['results']:
+                f.write(json.dumps(result) + '\n')
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+import json
+import os
+from typing import List, Dict
+
+from vrp_algorithms import ROW_LIST_POINT_LIMIT
+
+# Calibrated runtime model shipped with the project (see vrp_portfolio.calibrate())
+RUNTIME_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'runtime_model.json')
+
+# Default admission limits: peak memory of the solve, and the predicted
+# runtime allowed (the wrapper kills C++ solves after 30 seconds)
+DEFAULT_MAX_MEMORY_BYTES = 2 * 1024 ** 3
+DEFAULT_MAX_SECONDS = 30.0
+
+# Cheaper algorithms tried, in order, when the requested one does not fit
+DOWNGRADE_ALGORITHMS = ['nearest', 'sweep']
+
+# Algorithms that only need O(n) distances; in Python they compute them on
+# demand instead of building a dense n x n matrix
+MATRIX_FREE_ALGORITHMS = {'sweep'}
+
+# Mirrors DENSE_MATRIX_POINT_LIMIT in vrp_solver.cpp
+CPP_DENSE_MATRIX_POINT_LIMIT = 5000
+
+# Measured footprints: a Python savings entry is a (float, int, int) tuple in
+# a list (~130 bytes), a C++ one is 16 bytes in a vector that may have grown
+# to twice its size. Per-point costs cover route lists, flags and the like.
+PYTHON_SAVING_BYTES = 130
+CPP_SAVING_BYTES = 32
+PYTHON_POINT_BYTES = 512
+CPP_POINT_BYTES = 256
+# Nested-list copy of a dense matrix: list slot plus float object per entry
+PYTHON_ROW_LIST_BYTES = 32
+
+# Growth of each algorithm's running time as a power of n, the lowest
+# exponent a fitted runtime model may have: nearest neighbour, the savings
+# list and the enhanced insertion scan all look at every pair of points,
+# sweep sorts by angle and 2-opt works route by route
+COMPLEXITY_EXPONENTS = {
+    'enhanced': 2.0,
+    'nearest': 2.0,
+    'clarke': 2.0,
+    'sweep': 1.0,
+    'two_opt': 1.0,
+}
+
+# Observed slowdown of the Python algorithms when distances are computed on
+# demand instead of read from a dense matrix
+MATRIX_FREE_SLOWDOWN = 2.0
+
+
+class AdmissionError(RuntimeError):
+    """Raised when no algorithm/backend fits the admission limits"""
+
+    def __init__(self, plan: Dict):
+        super().__init__(plan['reason'])
+        self.plan = plan
+
+
+def load_runtime_model(path: str = RUNTIME_MODEL_PATH) -> Dict:
+    """Load the runtime model, returning an empty model if none exists"""
+    if not os.path.exists(path):
+        return {'models': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def model_key(algorithm: str, backend: str, n: int) -> str:
+    """Runtime model entry for a solve
+
+    C++ solves above the dense-matrix limit compute distances on demand and
+    are calibrated separately.
+    """
+    if backend == 'cpp' and n > CPP_DENSE_MATRIX_POINT_LIMIT:
+        return f"{algorithm}/cpp/euclidean"
+    return f"{algorithm}/{backend}"
+
+
+def predict_runtime(model: Dict, algorithm: str, backend: str, n: int):
+    """Predicted seconds for `algorithm` on `backend` with n points, or None if uncalibrated
+
+    Beyond the largest size the model was measured at, the fit is not
+    trusted: the time at that size is scaled up by the algorithm's known
+    complexity (or the fitted exponent, if steeper), a conservative bound.
+    """
+    models = model['models']
+    params = models.get(model_key(algorithm, backend, n)) or models.get(f"{algorithm}/{backend}")
+    if params is None:
+        return None
+    measured = params.get('maxSize') or max(model.get('sizes') or [n])
+    if n <= measured:
+        return params['c'] + params['a'] * n ** params['b']
+    exponent = max(params['b'], COMPLEXITY_EXPONENTS.get(algorithm, params['b']))
+    return (params['c'] + params['a'] * measured ** params['b']) * (n / measured) ** exponent
+
+
+def distance_mode_for(algorithm: str, backend: str, n: int, distance_mode: str) -> str:
+    """The distance mode a solve really uses
+
+    'dense' is the default precomputed matrix, 'euclidean' on-demand
+    distances and 'external' a caller-supplied matrix. Matrix-free
+    algorithms never build the default dense matrix in Python, and the C++
+    solver computes distances on demand above its dense-matrix limit.
+    """
+    if distance_mode != 'dense':
+        return distance_mode
+    if backend == 'cpp' and n > CPP_DENSE_MATRIX_POINT_LIMIT:
+        return 'euclidean'
+    if backend == 'python' and algorithm in MATRIX_FREE_ALGORITHMS:
+        return 'euclidean'
+    return distance_mode
+
+
+def estimate_memory(algorithm: str, backend: str, n: int, distance_mode: str = 'dense',
+                    symmetric: bool = True) -> int:
+    """Estimated peak bytes allocated by one solve of n points (depot included)
+
+    External matrices are not counted: they already exist or are memory
+    mapped from disk.
+    """
+    distance_mode = distance_mode_for(algorithm, backend, n, distance_mode)
+    pairs = n * (n - 1) // 2 if symmetric else n * (n - 1)
+
+    if backend == 'cpp':
+        total = CPP_POINT_BYTES * n
+        if distance_mode == 'dense':
+            total += 8 * n * n
+        # The C++ enhanced algorithm seeds its routes from the full savings list too
+        if algorithm in ('clarke', 'enhanced'):
+            total += CPP_SAVING_BYTES * pairs
+        return total
+
+    total = PYTHON_POINT_BYTES * n
+    if distance_mode == 'dense':
+        total += 8 * n * n
+    if distance_mode in ('dense', 'external') and n <= ROW_LIST_POINT_LIMIT:
+        total += PYTHON_ROW_LIST_BYTES * n * n
+    if algorithm == 'clarke':
+        total += PYTHON_SAVING_BYTES * pairs
+    return total
+
+
+def estimate_runtime(model: Dict, algorithm: str, backend: str, n: int, distance_mode: str = 'dense'):
+    """Predicted seconds for one solve, or None if the model has no data for it"""
+    predicted = predict_runtime(model, algorithm, backend, n)
+    if predicted is None:
+        return None
+    distance_mode = distance_mode_for(algorithm, backend, n, distance_mode)
+    if backend == 'python' and distance_mode == 'euclidean' and algorithm not in MATRIX_FREE_ALGORITHMS:
+        predicted *= MATRIX_FREE_SLOWDOWN
+    return predicted
+
+
+def plan_solve(algorithm: str, n: int, backends: List[str], distance_mode: str = 'dense', symmetric: bool = True,
+               max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES, max_seconds: float = DEFAULT_MAX_SECONDS,
+               allow_downgrade: bool = True, model: Dict = None, jit_warmup: float = 0.0) -> Dict:
+    """Decide before any heavy allocation how (and whether) to run a solve
+
+    Candidates are the requested algorithm on each of `backends` (in order
+    of preference) and then in Python with matrix-free distances, followed
+    by the same for each of DOWNGRADE_ALGORITHMS. The first whose estimated
+    memory and runtime fit the limits is chosen; unknown runtimes are not
+    held against a candidate. `jit_warmup` seconds (loading the JIT kernels)
+    are added to every Python candidate.
+    The returned plan's `decision` is 'accept' (first candidate fits),
+    'downgrade' or 'reject', with `requested` holding the estimate for what
+    was asked for.
+    """
+    if model is None:
+        model = load_runtime_model()
+
+    algorithms = [algorithm] + [fallback for fallback in DOWNGRADE_ALGORITHMS if fallback != algorithm]
+    candidates = []
+    for candidate_algorithm in algorithms if allow_downgrade else [algorithm]:
+        candidates.extend((candidate_algorithm, backend, distance_mode) for backend in backends)
+        if allow_downgrade and distance_mode == 'dense' and 'python' in backends:
+            candidates.append((candidate_algorithm, 'python', 'euclidean'))
+
+    plans = []
+    for candidate_algorithm, backend, mode in candidates:
+        mode = distance_mode_for(candidate_algorithm, backend, n, mode)
+        memory = estimate_memory(candidate_algorithm, backend, n, mode, symmetric)
+        seconds = estimate_runtime(model, candidate_algorithm, backend, n, mode)
+        if seconds is not None and backend == 'python':
+            seconds += jit_warmup
+        plan = {
+            'algorithm': candidate_algorithm,
+            'backend': backend,
+            'distanceMode': mode,
+            'estimatedMemory': memory,
+            'estimatedTime': seconds,
+            'fits': memory <= max_memory_bytes and (seconds is None or seconds <= max_seconds),
+        }
+        plans.append(plan)
+        if plan['fits']:
+            break
+
+    requested = plans[0]
+    chosen = plans[-1] if plans[-1]['fits'] else requested
+    if chosen is requested and requested['fits']:
+        decision, reason = 'accept', "within limits"
+    elif chosen['fits']:
+        decision = 'downgrade'
+        reason = (f"{algorithm} on {requested['backend']} exceeds the limits; "
+                  f"using {chosen['algorithm']} on {chosen['backend']} ({chosen['distanceMode']} distances)")
+    else:
+        decision = 'reject'
+        reason = (f"{algorithm} on {n} points needs ~{requested['estimatedMemory'] / 1e6:.0f} MB"
+                  + (f" and ~{requested['estimatedTime']:.1f} s" if requested['estimatedTime'] is not None else "")
+                  + f", over the limits of {max_memory_bytes / 1e6:.0f} MB / {max_seconds:.1f} s"
+                  + (" and no downgrade fits" if allow_downgrade else ""))
+
+    return {
+        'decision': decision,
+        'reason': reason,
+        'numPoints': n,
+        'algorithm': chosen['algorithm'],
+        'backend': chosen['backend'],
+        'distanceMode': chosen['distanceMode'],
+        'estimatedMemory': chosen['estimatedMemory'],
+        'estimatedTime': chosen['estimatedTime'],
+        'requested': {key: requested[key] for key in
+                      ('algorithm', 'backend', 'distanceMode', 'estimatedMemory', 'estimatedTime')},
+    }
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import List, Dict
+
+import numpy as np
+
+from vrp_algorithms import VRPAlgorithms
+from vrp_distance import EuclideanDistanceOracle
+from vrp_wrapper import CppVRPWrapper, PYTHON_ALGORITHMS
+from vrp_jit import NUMBA_AVAILABLE, warm_up
+from vrp_planner import COMPLEXITY_EXPONENTS, RUNTIME_MODEL_PATH, load_runtime_model, model_key, predict_runtime
+from vrp_verify import verify_solution
+
+# Candidate (algorithm, improve) pairs, best expected solution quality first.
+# `improve` re-optimises every route after construction; the enhanced and
+# sweep algorithms already do that internally. Sweep comes last as the
+# O(n log n) option for instances too large for everything else.
+PORTFOLIO = [
+    ('enhanced', False),
+    ('nearest', True),
+    ('clarke', True),
+    ('nearest', False),
+    ('clarke', False),
+    ('sweep', False),
+]
+
+# Pseudo-algorithm name used for the route improvement pass in the model
+IMPROVEMENT = 'two_opt'
+
+BACKENDS = ['cpp', 'python']
+
+_default_wrapper = None
+
+
+def choose_strategy(model: Dict, n: int, time_budget: float, backends: List[str] = None,
+                    jit_warmup: float = 0.0) -> Dict:
+    """Pick the best-quality (algorithm, backend, improve) whose predicted time fits the budget
+
+    Candidates are tried in PORTFOLIO order and, for each, the fastest
+    calibrated backend is used; Python predictions include `jit_warmup`
+    seconds for loading the JIT kernels. If nothing fits, the fastest
+    candidate overall is returned with `withinBudget` set to False.
+    """
+    backends = backends or BACKENDS
+    fastest = None
+
+    for algorithm, improve in PORTFOLIO:
+        best = None
+        for backend in backends:
+            predicted = predict_runtime(model, algorithm, backend, n)
+            if predicted is None:
+                continue
+            if backend == 'python':
+                predicted += jit_warmup
+            if improve:
+                improvement = predict_runtime(model, IMPROVEMENT, 'python', n)
+                if improvement is None:
+                    continue
+                predicted += improvement
+            if best is None or predicted < best['predictedTime']:
+                best = {'algorithm': algorithm, 'backend': backend, 'improve': improve, 'predictedTime': predicted}
+
+        if best is None:
+            continue
+        if best['predictedTime'] <= time_budget:
+            best['withinBudget'] = True
+            return best
+        if fastest is None or best['predictedTime'] < fastest['predictedTime']:
+            fastest = best
+
+    if fastest is None:
+        # Nothing calibrated at all: the cheapest construction, unpredicted
+        return {'algorithm': 'nearest', 'backend': backends[0], 'improve': False,
+                'predictedTime': None, 'withinBudget': False}
+
+    fastest['withinBudget'] = False
+    return fastest
+
+
+def improve_routes(points: List[Dict], routes: List[Dict], vehicle_capacity: int, num_vehicles: int) -> List[Dict]:
+    """Re-optimise every route of an existing solution (exactly when short, otherwise 2-opt)"""
+    # Only distances within each route are needed, so skip the dense matrix
+    solver = VRPAlgorithms(points, vehicle_capacity, num_vehicles, EuclideanDistanceOracle.from_points(points))
+    for route in routes:
+        if len(route['customers']) > 2:
+            route['customers'] = solver._optimize_route(route['customers'])
+            route['totalCost'] = solver._calculate_route_cost(route['customers'])
+    return routes
+
+
+def solve(points: List[Dict], vehicle_capacity: int, num_vehicles: int, time_budget: float = 5.0,
+          wrapper: CppVRPWrapper = None, model: Dict = None) -> Dict:
+    """Solve with the algorithm/backend that the runtime model says fits `time_budget` seconds
+
+    Returns the routes together with what actually ran (after admission
+    control and any fallback), its predicted and actual running time, and
+    whether it really finished within the budget. A C++ solve stopped at the
+    wrapper's timeout returns its best snapshot with `timedOut` set; such a
+    solution (or any that fails verification) is reported with `feasible`
+    False and never as within budget.
+    """
+    global _default_wrapper
+    if wrapper is None:
+        if _default_wrapper is None:
+            _default_wrapper = CppVRPWrapper()
+        wrapper = _default_wrapper
+    if model is None:
+        model = load_runtime_model()
+
+    backends = BACKENDS if wrapper.cpp_executable else ['python']
+    strategy = choose_strategy(model, len(points), time_budget, backends, wrapper.jit_warmup_time(len(points), model))
+
+    start = time.perf_counter()
+    routes = wrapper.run(strategy['algorithm'], points, vehicle_capacity, num_vehicles, backend=strategy['backend'])
+    verification = wrapper.last_verification if wrapper.verify else None
+    if strategy['improve']:
+        routes = improve_routes(points, routes, vehicle_capacity, num_vehicles)
+        if wrapper.verify:
+            verification = verify_solution(points, routes, vehicle_capacity, num_vehicles)
+    actual = time.perf_counter() - start
+
+    # Predict what ran: the plan after admission control and any fallback
+    predicted = wrapper.last_plan['estimatedTime']
+    if predicted is not None and strategy['improve']:
+        improvement = predict_runtime(model, IMPROVEMENT, 'python', len(points))
+        predicted = None if improvement is None else predicted + improvement
+    feasible = None if verification is None else verification['feasible']
+
+    return {
+        'routes': routes,
+        'totalCost': sum(route['totalCost'] for route in routes),
+        'numRoutes': len(routes),
+        'algorithm': wrapper.last_plan['algorithm'],
+        'backend': wrapper.last_backend,
+        'improve': strategy['improve'],
+        'predictedTime': predicted,
+        'actualTime': actual,
+        'timedOut': wrapper.last_timed_out,
+        'feasible': feasible,
+        'verification': verification,
+        'withinBudget': actual <= time_budget and not wrapper.last_timed_out and feasible is not False,
+    }
+
+
+def random_instance(num_customers: int, vehicle_capacity: int = 30, seed: int = 0) -> List[Dict]:
+    """Random instance laid out like the Streamlit demo (depot at the centre)"""
+    rng = random.Random(seed)
+    points = [{'x': 50, 'y': 50, 'demand': 0}]
+    for _ in range(num_customers):
+        points.append({
+            'x': rng.uniform(10, 90),
+            'y': rng.uniform(10, 90),
+            'demand': rng.randint(1, max(1, vehicle_capacity // 3))
+        })
+    return points
+
+
+def fit_power_law(sizes: List[int], times: List[float], min_exponent: float = 0.0) -> Dict:
+    """Fit t = c + a * n^b, where c is the fixed per-call overhead
+
+    The overhead is chosen from a few fractions of the fastest observed time
+    and a, b are then fitted by least squares in log-log space. The exponent
+    is kept at or above `min_exponent` (the algorithm's known complexity), so
+    samples dominated by process start-up cannot flatten the curve; a single
+    sample is fitted with exactly that exponent, and with two or fewer
+    samples there is too little data to separate an overhead from n^b.
+    """
+    sizes = np.asarray(sizes, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
+    log_sizes = np.log(sizes)
+    best = None
+    for fraction in (0.0, 0.25, 0.5, 0.75, 0.9) if len(sizes) > 2 else (0.0,):
+        c = fraction * times.min()
+        log_times = np.log(np.maximum(times - c, 1e-9))
+        b = np.polyfit(log_sizes, log_times, 1)[0] if len(sizes) > 1 else min_exponent
+        b = max(b, min_exponent)
+        a = math.exp(np.mean(log_times - b * log_sizes))
+        error = float(np.sum((c + a * sizes ** b - times) ** 2 / times ** 2))
+        if best is None or error < best[0]:
+            best = (error, {'a': float(a), 'b': float(b), 'c': float(c)})
+    return best[1]
+
+
+def measure_jit_warmup() -> float:
+    """Seconds a fresh process spends loading the JIT kernels from Numba's on-disk cache"""
+    warm_up()  # Compiles them into the cache if they are not there yet
+    result = subprocess.run([sys.executable, '-c', 'import vrp_jit; print(vrp_jit.warm_up())'],
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    return float(result.stdout)
+
+
+def calibrate(wrapper: CppVRPWrapper = None,
+              sizes=(10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000),
+              repeats: int = 3, max_seconds: float = 2.0, path: str = RUNTIME_MODEL_PATH) -> Dict:
+    """Benchmark every algorithm/backend on random instances and store the fitted model
+
+    A combination stops growing once a single run exceeds `max_seconds`.
+    Combinations that silently fell back to another backend (or were
+    downgraded by admission control, which only checks memory while
+    calibrating) are discarded. C++ sizes above the dense-matrix limit are
+    fitted as a separate model (see vrp_planner.model_key()), and every
+    model records the largest size it was measured at as `maxSize`. Python
+    is timed without the JIT kernels, so its model is an upper bound; with
+    Numba installed the time a fresh process needs to load the (cached)
+    kernels is stored as `jitWarmup`.
+    """
+    wrapper = wrapper or CppVRPWrapper()
+    use_jit, wrapper.use_jit = wrapper.use_jit, False
+    # The model being replaced must not veto (or downgrade) the sizes measured
+    runtime_model, wrapper.runtime_model = wrapper.runtime_model, {'models': {}}
+    vehicle_capacity = 30
+    backends = BACKENDS if wrapper.cpp_executable else ['python']
+    samples = {}
+
+    def timed(key, n, run):
+        # `run` returns the elapsed seconds of one repeat, or None if it fell back
+        best = float('inf')
+        for repeat in range(repeats):
+            elapsed = run(repeat)
+            if elapsed is None:
+                return float('inf')
+            best = min(best, elapsed)
+        samples.setdefault(key, []).append((n, best))
+        return best
+
+    for algorithm in PYTHON_ALGORITHMS:
+        for backend in backends:
+            for n in sizes:
+                def run(repeat):
+                    points = random_instance(n, vehicle_capacity, seed=repeat)
+                    start = time.perf_counter()
+                    wrapper.run(algorithm, points, vehicle_capacity, max(1, n // 3), backend=backend)
+                    elapsed = time.perf_counter() - start
+                    fell_back = wrapper.last_backend != backend or wrapper.last_plan['decision'] != 'accept'
+                    return None if fell_back else elapsed
+                if timed(model_key(algorithm, backend, n), n, run) > max_seconds:
+                    break
+
+    for n in sizes:
+        def run(repeat):
+            points = random_instance(n, vehicle_capacity, seed=repeat)
+            distances = EuclideanDistanceOracle.from_points(points)  # No dense matrix at the largest sizes
+            routes = VRPAlgorithms(points, vehicle_capacity, n, distances).nearest_neighbor_algorithm()
+            start = time.perf_counter()
+            improve_routes(points, routes, vehicle_capacity, n)
+            return time.perf_counter() - start
+        if timed(f"{IMPROVEMENT}/python", n, run) > max_seconds:
+            break
+
+    wrapper.use_jit = use_jit
+    wrapper.runtime_model = runtime_model
+
+    models = {}
+    for key, points in samples.items():
+        measured_sizes, times = zip(*points)
+        params = fit_power_law(measured_sizes, times, COMPLEXITY_EXPONENTS[key.split('/')[0]])
+        models[key] = dict(params, maxSize=max(measured_sizes))
+    model = {'sizes': list(sizes), 'models': models}
+    if NUMBA_AVAILABLE:
+        model['jitWarmup'] = measure_jit_warmup()
+    with open(path, 'w') as f:
+        json.dump(model, f, indent=2, sort_keys=True)
+    return model
+
+
+if __name__ == "__main__":
+    model = calibrate()
+    for key, params in sorted(model['models'].items()):
+        print(f"{key}: t = {params['c']:.3g} + {params['a']:.3g} * n^{params['b']:.2f}")
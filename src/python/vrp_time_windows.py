@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+from collections import namedtuple
+from typing import List, Dict
+
+import numpy as np
+
+# Optional point dict keys describing a customer's delivery window. Travel
+# time between two points equals their distance.
+READY_TIME = 'readyTime'
+DUE_TIME = 'dueTime'
+SERVICE_TIME = 'serviceTime'
+
+# Slack used when comparing times so rounding never rejects an exact fit
+TIME_EPSILON = 1e-9
+
+# A sequence of consecutive visits, summarised so that two sequences can be
+# joined in O(1) (Savelsbergh / Vidal concatenation):
+#   duration - time from service start at `first` to service end at `last`
+#   earliest - earliest service start at `first` that avoids needless waiting
+#   latest   - latest service start at `first` that keeps every window
+Segment = namedtuple('Segment', ['first', 'last', 'duration', 'earliest', 'latest', 'feasible'])
+
+
+def has_time_windows(points: List[Dict]) -> bool:
+    """Whether any point carries time-window or service-time data"""
+    return any(READY_TIME in point or DUE_TIME in point or SERVICE_TIME in point for point in points)
+
+
+def time_window_arrays(points: List[Dict]):
+    """(ready, due, service) arrays with defaults 0, infinity and 0"""
+    ready = np.array([point.get(READY_TIME, 0.0) for point in points], dtype=np.float64)
+    due = np.array([point.get(DUE_TIME, np.inf) for point in points], dtype=np.float64)
+    service = np.array([point.get(SERVICE_TIME, 0.0) for point in points], dtype=np.float64)
+    return ready, due, service
+
+
+class RouteSchedule:
+    """Forward and backward segments of a route, depot included at both ends
+
+    forward[p] covers the depot followed by the first p customers and gives
+    the earliest time the vehicle can leave customer p; backward[p] covers
+    customer p onwards back to the depot and gives the latest time service
+    at customer p may start. Any insertion or reversal can then be checked
+    by joining at most three segments.
+    """
+
+    def __init__(self, forward: List[Segment], backward: List[Segment]):
+        self.forward = forward
+        self.backward = backward
+
+
+class TimeWindows:
+    """Constant-time feasibility checks for routes with delivery windows"""
+
+    def __init__(self, points: List[Dict], distances):
+        self.distances = distances
+        ready, due, service = time_window_arrays(points)
+        self.ready = ready.tolist()
+        self.due = due.tolist()
+        self.service = service.tolist()
+        self._nodes = [Segment(i, i, self.service[i], self.ready[i], self.due[i], self.ready[i] <= self.due[i])
+                       for i in range(len(points))]
+        self.empty_schedule = self.schedule([])
+
+    def node(self, i: int) -> Segment:
+        return self._nodes[i]
+
+    def concat(self, a: Segment, b: Segment) -> Segment:
+        """Join segment `a` followed by segment `b`"""
+        # Time from service start at a.first to arrival at b.first
+        delta = a.duration + self.distances.distance(a.last, b.first)
+        wait = max(b.earliest - delta - a.latest, 0.0)
+        warp = a.earliest + delta - b.latest
+        return Segment(
+            a.first, b.last,
+            delta + b.duration + wait,
+            max(b.earliest - delta, a.earliest) - wait,
+            min(b.latest - delta, a.latest),
+            a.feasible and b.feasible and warp <= TIME_EPSILON
+        )
+
+    def schedule(self, route: List[int]) -> RouteSchedule:
+        """Build the forward/backward bookkeeping for a route in O(len(route))"""
+        depot = self._nodes[0]
+        forward = [depot]
+        for customer in route:
+            forward.append(self.concat(forward[-1], self._nodes[customer]))
+        backward = [depot]
+        for customer in reversed(route):
+            backward.append(self.concat(self._nodes[customer], backward[-1]))
+        backward.reverse()
+        return RouteSchedule(forward, backward)
+
+    def can_insert(self, schedule: RouteSchedule, customer: int, position: int) -> bool:
+        """Whether inserting `customer` before position `position` keeps every window"""
+        head = self.concat(schedule.forward[position], self._nodes[customer])
+        return head.feasible and self.concat(head, schedule.backward[position]).feasible
+
+    def can_reverse(self, schedule: RouteSchedule, start: int, end: int, reversed_segment: Segment) -> bool:
+        """Whether the route stays feasible with customers start..end-1 replaced by `reversed_segment`"""
+        head = self.concat(schedule.forward[start], reversed_segment)
+        return head.feasible and self.concat(head, schedule.backward[end]).feasible
+
+    def is_feasible(self, route: List[int]) -> bool:
+        segment = self._nodes[0]
+        for customer in route:
+            segment = self.concat(segment, self._nodes[customer])
+            if not segment.feasible:
+                return False
+        return self.concat(segment, self._nodes[0]).feasible
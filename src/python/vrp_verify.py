@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+from itertools import chain
+from typing import List, Dict
+
+import numpy as np
+
+from vrp_distance import DistanceOracle, EuclideanDistanceOracle
+from vrp_time_windows import has_time_windows, time_window_arrays, TIME_EPSILON
+
+
+def flatten_routes(routes: List[Dict]):
+    """Flatten routes into (stops, route_ids, starts, lengths) arrays
+
+    `stops` holds every customer of every route back to back, `route_ids`
+    the index of the route each stop belongs to, and `starts`/`lengths` the
+    offset and size of each route within `stops`.
+    """
+    lengths = np.fromiter((len(route['customers']) for route in routes), dtype=np.int64, count=len(routes))
+    total = int(lengths.sum())
+    stops = np.fromiter(chain.from_iterable(route['customers'] for route in routes), dtype=np.int64, count=total)
+    route_ids = np.repeat(np.arange(len(routes), dtype=np.int64), lengths)
+    starts = np.cumsum(lengths) - lengths
+    return stops, route_ids, starts, lengths
+
+
+def leg_distances(distances: DistanceOracle, stops: np.ndarray, starts: np.ndarray, lengths: np.ndarray):
+    """Distance of the leg into every stop and of each route's return to the depot
+
+    Returns (legs, returns) where legs[k] is the distance from the previous
+    stop (or the depot) to stops[k], and returns[r] is the distance from the
+    last stop of route r back to the depot (0 for empty routes).
+    """
+    nonempty = lengths > 0
+    previous = np.empty_like(stops)
+    previous[1:] = stops[:-1]
+    previous[starts[nonempty]] = 0
+
+    legs = distances.pairs(previous, stops) if len(stops) else np.zeros(0)
+    returns = np.zeros(len(lengths))
+    last = (starts + lengths - 1)[nonempty]
+    if len(last):
+        returns[nonempty] = distances.pairs(stops[last], np.zeros_like(last))
+    return legs, returns
+
+
+def late_routes(points: List[Dict], stops: np.ndarray, starts: np.ndarray, lengths: np.ndarray,
+                legs: np.ndarray, returns: np.ndarray) -> np.ndarray:
+    """Indices of routes that miss a customer's or the depot's time window
+
+    Routes are simulated side by side, one stop position at a time, so the
+    Python loop runs over the longest route length rather than over stops.
+    """
+    ready, due, service = time_window_arrays(points)
+    times = np.full(len(lengths), ready[0] + service[0])
+    late = np.zeros(len(lengths), dtype=bool)
+
+    for position in range(int(lengths.max()) if len(lengths) else 0):
+        active = np.flatnonzero(lengths > position)
+        index = starts[active] + position
+        customers = stops[index]
+        arrival = times[active] + legs[index]
+        late[active] |= arrival > due[customers] + TIME_EPSILON
+        times[active] = np.maximum(arrival, ready[customers]) + service[customers]
+
+    late |= (lengths > 0) & (times + returns > due[0] + TIME_EPSILON)
+    return np.flatnonzero(late)
+
+
+def verify_solution(points: List[Dict], routes: List[Dict], vehicle_capacity: int, num_vehicles: int,
+                    distances: DistanceOracle = None, cost_tolerance: float = 1e-5) -> Dict:
+    """Independently check a solution and recompute its route costs
+
+    Checks that every customer is served exactly once, that no route exceeds
+    the vehicle capacity, that no more than `num_vehicles` routes are used
+    and that the reported totalCost/totalDemand of each route match the
+    recomputed values (costs within a relative `cost_tolerance`). When the
+    points carry time windows every route is also checked against them.
+    """
+    n = len(points)
+    distances = distances if distances is not None else EuclideanDistanceOracle.from_points(points)
+    demands = np.fromiter((point['demand'] for point in points), dtype=np.float64, count=n)
+
+    stops, route_ids, starts, lengths = flatten_routes(routes)
+    errors = []
+
+    # Stops that are not customer indices (including the depot) cannot be
+    # gathered; count them as errors and treat them as the depot from here on
+    invalid = (stops < 1) | (stops >= n)
+    invalid_stops = np.unique(stops[invalid])
+    if invalid.any():
+        errors.append(f"{int(invalid.sum())} stops are not valid customer indices")
+        stops = np.where(invalid, 0, stops)
+
+    served = np.bincount(stops[~invalid], minlength=n)
+    missing = np.flatnonzero(served[1:] == 0) + 1
+    duplicates = np.flatnonzero(served > 1)
+    if len(missing):
+        errors.append(f"{len(missing)} customers are not served")
+    if len(duplicates):
+        errors.append(f"{len(duplicates)} customers are served more than once")
+
+    route_demands = np.bincount(route_ids, weights=demands[stops], minlength=len(routes))
+    over_capacity = np.flatnonzero(route_demands > vehicle_capacity)
+    if len(over_capacity):
+        errors.append(f"{len(over_capacity)} routes exceed the vehicle capacity of {vehicle_capacity}")
+
+    if len(routes) > num_vehicles:
+        errors.append(f"{len(routes)} routes use more than the {num_vehicles} available vehicles")
+
+    legs, returns = leg_distances(distances, stops, starts, lengths)
+    route_costs = np.bincount(route_ids, weights=legs, minlength=len(routes)) + returns
+
+    late = np.zeros(0, dtype=np.int64)
+    if has_time_windows(points):
+        late = late_routes(points, stops, starts, lengths, legs, returns)
+        if len(late):
+            errors.append(f"{len(late)} routes violate a time window")
+
+    reported_costs = np.fromiter((route['totalCost'] for route in routes), dtype=np.float64, count=len(routes))
+    reported_demands = np.fromiter((route['totalDemand'] for route in routes), dtype=np.float64, count=len(routes))
+    cost_mismatch = np.flatnonzero(
+        np.abs(reported_costs - route_costs) > cost_tolerance * np.maximum(1.0, route_costs))
+    demand_mismatch = np.flatnonzero(reported_demands != route_demands)
+    if len(cost_mismatch):
+        errors.append(f"{len(cost_mismatch)} routes report a cost that does not match the recomputed cost")
+    if len(demand_mismatch):
+        errors.append(f"{len(demand_mismatch)} routes report a demand that does not match their customers")
+
+    return {
+        'feasible': not errors,
+        'errors': errors,
+        'invalidStops': invalid_stops.tolist(),
+        'missingCustomers': missing.tolist(),
+        'duplicateCustomers': duplicates.tolist(),
+        'overCapacityRoutes': over_capacity.tolist(),
+        'costMismatchRoutes': cost_mismatch.tolist(),
+        'demandMismatchRoutes': demand_mismatch.tolist(),
+        'lateRoutes': late.tolist(),
+        'routeCosts': route_costs,
+        'routeDemands': route_demands,
+        'totalCost': float(route_costs.sum()),
+    }
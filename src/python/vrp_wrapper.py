@@ -3,52 +3,118 @@ import json
 import tempfile
 import os
 import sys
+import queue
+import threading
+import time
+import numpy as np
 from vrp_algorithms import VRPAlgorithms
+from vrp_jit import JitVRPAlgorithms, NUMBA_AVAILABLE, JIT_MIN_POINTS, is_warm, warm_up
+from vrp_distance import DenseDistanceMatrix, EuclideanDistanceOracle
+from vrp_verify import verify_solution
+from vrp_time_windows import has_time_windows, time_window_arrays
+from vrp_planner import (AdmissionError, MATRIX_FREE_ALGORITHMS, DEFAULT_MAX_MEMORY_BYTES, DEFAULT_MAX_SECONDS,
+                         load_runtime_model, plan_solve)
+
+# Mirrors SOLVER_PROTOCOL in vrp_solver.cpp: binaries built from other
+# source (arguments, progress stream, matrix files) are rebuilt
+SOLVER_PROTOCOL = 3
+
+# Held while a wrapper looks for (and if needed rebuilds) the solver binary
+_compile_lock = threading.Lock()
+
+# Solver algorithm names (as understood by the C++ binary) and the
+# VRPAlgorithms method implementing each one in Python
+PYTHON_ALGORITHMS = {
+    'enhanced': 'enhanced_custom_algorithm',
+    'nearest': 'nearest_neighbor_algorithm',
+    'clarke': 'clarke_wright_algorithm',
+    'sweep': 'sweep_algorithm',
+}
 
 class CppVRPWrapper:
-    def __init__(self):
+    def __init__(self, verify=True, max_memory_bytes=DEFAULT_MAX_MEMORY_BYTES, max_seconds=DEFAULT_MAX_SECONDS,
+                 allow_downgrade=True, use_jit=True):
         self.cpp_executable = None
+        self.last_backend = None
+        # Every solution is independently checked unless verify is False
+        self.verify = verify
+        self.last_verification = None
+        # Admission limits checked by plan() before every solve
+        self.max_memory_bytes = max_memory_bytes
+        self.max_seconds = max_seconds
+        self.allow_downgrade = allow_downgrade
+        self.runtime_model = load_runtime_model()
+        self.last_plan = None
+        # Set when a C++ solve failed and was re-planned and run in Python
+        self.last_fallback = False
+        # C++ solves running longer are stopped and return their best snapshot
+        self.cpp_timeout = 30
+        self.last_timed_out = False
+        # The Python backend uses the Numba-compiled kernels when Numba is
+        # installed, once they are warm or for instances big enough to pay
+        # for loading them (see uses_jit())
+        self.use_jit = use_jit
         self._compile_cpp()
     
     def _compile_cpp(self):
-        """Compile the C++ VRP solver"""
-        try:
-            import os
-            # Get the absolute path to the project root
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(current_dir)
-            cpp_dir = os.path.join(project_root, 'cpp')
-            
-            # Check if executable already exists
-            cpp_path = os.path.join(cpp_dir, 'vrp_solver')
-            if os.path.exists(cpp_path):
-                self.cpp_executable = cpp_path
-                print("✅ C++ VRP solver found")
-                return
-            
-            # Try to compile if not found
-            cpp_source = os.path.join(cpp_dir, 'vrp_solver.cpp')
-            if os.path.exists(cpp_source):
-                print(f"🔧 Attempting to compile C++ solver from {cpp_source}")
-                result = subprocess.run([
-                    'g++', '-std=c++17', '-O2', cpp_source, '-o', cpp_path
-                ], capture_output=True, text=True, timeout=30, cwd=cpp_dir)
+        """Compile the C++ VRP solver
+        
+        Serialised across wrappers (e.g. one per worker thread) so a stale
+        binary is only rebuilt once; the new binary is swapped in atomically.
+        """
+        with _compile_lock:
+            try:
+                import os
+                # Get the absolute path to the project root
+                current_dir = os.path.dirname(os.path.abspath(__file__))
+                project_root = os.path.dirname(current_dir)
+                cpp_dir = os.path.join(project_root, 'cpp')
+                
+                # Check if executable already exists and speaks this wrapper's protocol
+                cpp_path = os.path.join(cpp_dir, 'vrp_solver')
+                if os.path.exists(cpp_path):
+                    if self._solver_protocol(cpp_path) == SOLVER_PROTOCOL:
+                        self.cpp_executable = cpp_path
+                        print("✅ C++ VRP solver found")
+                        return
+                    print("🔧 C++ VRP solver is out of date or cannot run here; rebuilding")
                 
-                if result.returncode == 0:
-                    self.cpp_executable = cpp_path
-                    print("✅ C++ VRP solver compiled successfully")
+                # Try to compile if not found (or stale)
+                cpp_source = os.path.join(cpp_dir, 'vrp_solver.cpp')
+                if os.path.exists(cpp_source):
+                    print(f"🔧 Attempting to compile C++ solver from {cpp_source}")
+                    build_path = f"{cpp_path}.{os.getpid()}.tmp"
+                    result = subprocess.run([
+                        'g++', '-std=c++17', '-O2', cpp_source, '-o', build_path
+                    ], capture_output=True, text=True, timeout=30, cwd=cpp_dir)
+                    
+                    if result.returncode == 0:
+                        os.replace(build_path, cpp_path)
+                        self.cpp_executable = cpp_path
+                        print("✅ C++ VRP solver compiled successfully")
+                    else:
+                        print(f"❌ Compilation failed: {result.stderr}")
+                        print("⚠️ Using Python fallback implementation")
+                        self.cpp_executable = None
                 else:
-                    print(f"❌ Compilation failed: {result.stderr}")
+                    print(f"❌ C++ source file not found at {cpp_source}")
                     print("⚠️ Using Python fallback implementation")
                     self.cpp_executable = None
-            else:
-                print(f"❌ C++ source file not found at {cpp_source}")
+            except Exception as e:
+                print(f"❌ Compilation error: {e}")
                 print("⚠️ Using Python fallback implementation")
                 self.cpp_executable = None
-        except Exception as e:
-            print(f"❌ Compilation error: {e}")
-            print("⚠️ Using Python fallback implementation")
-            self.cpp_executable = None
+    
+    def _solver_protocol(self, cpp_path):
+        """Protocol version reported by `vrp_solver --version`, or None"""
+        try:
+            result = subprocess.run([cpp_path, '--version'], capture_output=True, text=True, timeout=10)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        fields = result.stdout.split()
+        if result.returncode != 0 or len(fields) != 3 or fields[:2] != ['vrp_solver', 'protocol']:
+            return None
+        return int(fields[2]) if fields[2].isdigit() else None
     
     def _create_input_file(self, points, vehicle_capacity, num_vehicles):
         """Create input file for C++ solver"""
@@ -56,9 +122,15 @@ class CppVRPWrapper:
             # Write problem parameters
             f.write(f"{len(points)} {vehicle_capacity} {num_vehicles}\n")
             
-            # Write points (depot first, then customers)
-            for i, point in enumerate(points):
-                f.write(f"{point['x']} {point['y']} {point['demand']} {i}\n")
+            # Write points (depot first, then customers), with time windows
+            # appended to every line when the problem has them
+            if has_time_windows(points):
+                ready, due, service = (values.tolist() for values in time_window_arrays(points))
+                for i, point in enumerate(points):
+                    f.write(f"{point['x']} {point['y']} {point['demand']} {i} {ready[i]!r} {due[i]!r} {service[i]!r}\n")
+            else:
+                for i, point in enumerate(points):
+                    f.write(f"{point['x']} {point['y']} {point['demand']} {i}\n")
             
             return f.name
     
@@ -95,109 +167,296 @@ class CppVRPWrapper:
         
         return routes
     
-    def solve_enhanced_custom(self, points, vehicle_capacity, num_vehicles):
-        """Solve using Enhanced Custom Algorithm"""
-        if not self.cpp_executable:
-            print("⚠️ Using Python Enhanced Custom algorithm")
-            solver = VRPAlgorithms(points, vehicle_capacity, num_vehicles)
-            return solver.enhanced_custom_algorithm()
+    def _solve_python(self, algorithm, points, vehicle_capacity, num_vehicles, distances=None,
+                      progress_callback=None, improve=True):
+        """Solve with VRPAlgorithms, JIT-compiled (same routes, faster) when uses_jit() says so"""
+        if distances is None and algorithm in MATRIX_FREE_ALGORITHMS:
+            distances = EuclideanDistanceOracle.from_points(points)
+        algorithms = VRPAlgorithms
+        if self.uses_jit(len(points)):
+            warm_up()
+            algorithms = JitVRPAlgorithms
+        solver = algorithms(points, vehicle_capacity, num_vehicles, distances, progress_callback=progress_callback)
+        self.last_backend = 'python'
+        if algorithm == 'sweep':
+            return solver.sweep_algorithm(improve)
+        return getattr(solver, PYTHON_ALGORITHMS[algorithm])()
+    
+    def uses_jit(self, n):
+        """Whether a Python solve of n points runs on the JIT kernels"""
+        return self.use_jit and NUMBA_AVAILABLE and (is_warm() or n >= JIT_MIN_POINTS)
+    
+    def jit_warmup_time(self, n, model=None):
+        """Predicted one-off seconds spent loading the JIT kernels before a Python solve of n points"""
+        if not self.uses_jit(n) or is_warm():
+            return 0.0
+        return (model or self.runtime_model).get('jitWarmup', 0.0)
+    
+    def _matrix_arguments(self, distances):
+        """C++ arguments for an external distance matrix and any temp file to delete
         
-        try:
-            print(f"🔧 Using C++ solver: {self.cpp_executable}")
-            input_file = self._create_input_file(points, vehicle_capacity, num_vehicles)
-            
-            # Get the cpp directory for working directory
-            cpp_dir = os.path.dirname(self.cpp_executable)
-            
-            # Run C++ solver with enhanced algorithm
-            result = subprocess.run([
-                self.cpp_executable, 'enhanced', input_file
-            ], capture_output=True, text=True, timeout=30, cwd=cpp_dir)
-            
-            os.unlink(input_file)  # Clean up
-            
-            if result.returncode == 0:
-                print("✅ C++ Enhanced Custom algorithm executed successfully")
-                return self._parse_output(result.stdout)
-            else:
-                print(f"❌ C++ solver error: {result.stderr}")
-                print("⚠️ Falling back to Python implementation")
-                solver = VRPAlgorithms(points, vehicle_capacity, num_vehicles)
-                return solver.enhanced_custom_algorithm()
-                
-        except Exception as e:
-            print(f"❌ C++ solver exception: {e}")
-            print("⚠️ Falling back to Python implementation")
-            solver = VRPAlgorithms(points, vehicle_capacity, num_vehicles)
-            return solver.enhanced_custom_algorithm()
+        File-backed matrices are handed over by path and byte offset so the
+        solver maps the same file; in-memory matrices are written once as
+        raw float64. Euclidean oracles need nothing since the solver computes
+        those distances itself.
+        """
+        if not isinstance(distances, DenseDistanceMatrix):
+            return [], None
+        
+        temp_file = None
+        source = distances.source
+        if source is None:
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.bin') as f:
+                np.ascontiguousarray(distances.matrix, dtype='<f8').tofile(f)
+                temp_file = f.name
+            source = (temp_file, 0)
+        
+        symmetry = 'symmetric' if distances.symmetric else 'asymmetric'
+        return [source[0], str(source[1]), symmetry], temp_file
     
-    def solve_nearest_neighbor(self, points, vehicle_capacity, num_vehicles):
-        """Solve using Nearest Neighbor Algorithm"""
-        if not self.cpp_executable:
-            print("⚠️ Using Python Nearest Neighbor algorithm")
-            solver = VRPAlgorithms(points, vehicle_capacity, num_vehicles)
-            return solver.nearest_neighbor_algorithm()
+    def _read_progress(self, stream, events, errors):
+        """Reader thread: turn the solver's PROGRESS/SNAPSHOT blocks into events
         
+        Every event (with its snapshot parsed into `routes`) is put on the
+        `events` queue, followed by None once the stream closes, even when
+        the output cannot be parsed. Any other stderr output is collected in
+        `errors`.
+        """
+        event = None
         try:
-            input_file = self._create_input_file(points, vehicle_capacity, num_vehicles)
-            
-            # Get the cpp directory for working directory
-            cpp_dir = os.path.dirname(self.cpp_executable)
-            
-            # Run C++ solver with nearest neighbor algorithm
-            result = subprocess.run([
-                self.cpp_executable, 'nearest', input_file
-            ], capture_output=True, text=True, timeout=30, cwd=cpp_dir)
-            
-            os.unlink(input_file)  # Clean up
-            
-            if result.returncode == 0:
-                return self._parse_output(result.stdout)
-            else:
-                print(f"❌ C++ solver error: {result.stderr}")
-                print("⚠️ Falling back to Python implementation")
-                solver = VRPAlgorithms(points, vehicle_capacity, num_vehicles)
-                return solver.nearest_neighbor_algorithm()
-                
-        except Exception as e:
-            print(f"❌ C++ solver exception: {e}")
-            print("⚠️ Falling back to Python implementation")
-            solver = VRPAlgorithms(points, vehicle_capacity, num_vehicles)
-            return solver.nearest_neighbor_algorithm()
+            for line in iter(stream.readline, ''):
+                if line.startswith('PROGRESS '):
+                    phase, assigned, total, cost, moves, elapsed = line.split()[1:]
+                    event = {'backend': 'cpp', 'phase': phase, 'assigned': int(assigned), 'total': int(total),
+                             'cost': float(cost), 'moves': int(moves), 'elapsed': float(elapsed)}
+                elif line.startswith('SNAPSHOT') and event is not None:
+                    count = stream.readline()
+                    lines = [count] + [stream.readline() for _ in range(int(count))]
+                    event['routes'] = self._parse_output(''.join(lines))
+                    events.put(event)
+                    event = None
+                else:
+                    errors.append(line)
+        except (ValueError, IndexError) as e:
+            # Typically a snapshot cut off by the solver dying; keep draining
+            # so a still-running solver never blocks on a full pipe
+            errors.append(f"Unreadable progress output ({e})\n")
+            errors.extend(iter(stream.readline, ''))
+        finally:
+            events.put(None)
     
-    def solve_clarke_wright(self, points, vehicle_capacity, num_vehicles):
-        """Solve using Clarke-Wright Algorithm"""
-        if not self.cpp_executable:
-            print("⚠️ Using Python Clarke-Wright algorithm")
-            solver = VRPAlgorithms(points, vehicle_capacity, num_vehicles)
-            return solver.clarke_wright_algorithm()
+    def _solve_cpp(self, algorithm, points, vehicle_capacity, num_vehicles, distances=None,
+                   progress_callback=None, improve=True):
+        """Solve with the compiled C++ solver, raising on any solver failure
         
+        The solver streams progress events with best-so-far snapshots, which
+        are handed to `progress_callback` on the calling thread. A solve that
+        runs past `cpp_timeout` seconds is stopped and its last snapshot is
+        returned with `last_timed_out` set; without a non-empty snapshot yet
+        (the savings phase reports no routes) the timeout is raised like any
+        other failure, so the solve falls back to Python.
+        """
+        input_file = self._create_input_file(points, vehicle_capacity, num_vehicles)
+        matrix_args, matrix_file = self._matrix_arguments(distances)
         try:
-            input_file = self._create_input_file(points, vehicle_capacity, num_vehicles)
-            
             # Get the cpp directory for working directory
             cpp_dir = os.path.dirname(self.cpp_executable)
             
-            # Run C++ solver with Clarke-Wright algorithm
-            result = subprocess.run([
-                self.cpp_executable, 'clarke', input_file
-            ], capture_output=True, text=True, timeout=30, cwd=cpp_dir)
+            command = [self.cpp_executable, algorithm, input_file] + matrix_args + ['--progress']
+            if not improve:
+                command.append('--no-improve')
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=cpp_dir)
+            events = queue.Queue()
+            errors = []
+            output = []
+            readers = [
+                threading.Thread(target=self._read_progress, args=(process.stderr, events, errors), daemon=True),
+                threading.Thread(target=lambda: output.append(process.stdout.read()), daemon=True),
+            ]
+            for reader in readers:
+                reader.start()
             
-            os.unlink(input_file)  # Clean up
+            deadline = time.monotonic() + self.cpp_timeout
+            snapshot = None
+            timed_out = False
+            while True:
+                try:
+                    event = events.get(timeout=max(0.0, min(0.1, deadline - time.monotonic())))
+                except queue.Empty:
+                    event = False
+                if event is None:
+                    break  # The solver closed stderr, so it is finishing
+                if event:
+                    snapshot = event['routes']
+                    if progress_callback is not None:
+                        progress_callback(event)
+                if time.monotonic() >= deadline:
+                    timed_out = True
+                    process.kill()
+                    break
             
-            if result.returncode == 0:
-                return self._parse_output(result.stdout)
-            else:
-                print(f"❌ C++ solver error: {result.stderr}")
+            process.wait()
+            if not timed_out:
+                # After a kill nothing more is needed from the (daemon) readers
+                for reader in readers:
+                    reader.join()
+        finally:
+            os.unlink(input_file)  # Clean up
+            if matrix_file:
+                os.unlink(matrix_file)
+        
+        if timed_out:
+            if not snapshot:
+                raise subprocess.TimeoutExpired(command, self.cpp_timeout)
+            print(f"⏱️ C++ {algorithm} solver timed out after {self.cpp_timeout}s; returning its best routes so far")
+            self.last_backend = 'cpp'
+            self.last_timed_out = True
+            return snapshot
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"C++ solver error: {''.join(errors)}")
+        
+        self.last_backend = 'cpp'
+        return self._parse_output(output[0])
+    
+    def plan(self, algorithm, points, backend='auto', distances=None):
+        """Estimate memory and runtime of a solve and decide whether/how to run it
+        
+        Nothing heavy is allocated; see vrp_planner.plan_solve() for the
+        returned plan.
+        """
+        if backend == 'auto':
+            backends = ['cpp', 'python'] if self.cpp_executable else ['python']
+        else:
+            backends = [backend]
+        
+        if distances is None:
+            distance_mode = 'dense'
+        elif isinstance(distances, DenseDistanceMatrix):
+            distance_mode = 'external'
+        else:
+            distance_mode = 'euclidean'
+        symmetric = distances is None or distances.symmetric
+        
+        return plan_solve(algorithm, len(points), backends, distance_mode, symmetric,
+                          self.max_memory_bytes, self.max_seconds, self.allow_downgrade, self.runtime_model,
+                          self.jit_warmup_time(len(points)))
+    
+    def _admit(self, plan, points, distances):
+        """Apply an admission plan: (algorithm, backend, distances) to run, or AdmissionError"""
+        estimated_time = "unknown" if plan['estimatedTime'] is None else f"{plan['estimatedTime']:.2f} s"
+        if plan['decision'] == 'reject':
+            print(f"🛑 {plan['reason']}")
+            raise AdmissionError(plan)
+        if plan['decision'] == 'downgrade':
+            print(f"⚠️ {plan['reason']}")
+            if (plan['distanceMode'] == 'euclidean' and distances is None
+                    and plan['algorithm'] not in MATRIX_FREE_ALGORITHMS):
+                distances = EuclideanDistanceOracle.from_points(points)
+        print(f"📐 {plan['algorithm']} on {len(points)} points: ~{plan['estimatedMemory'] / 1e6:.1f} MB, "
+              f"{estimated_time}")
+        return plan['algorithm'], plan['backend'], distances
+    
+    def run(self, algorithm, points, vehicle_capacity, num_vehicles, backend='auto', distances=None,
+            progress_callback=None, improve=True):
+        """Solve with the named algorithm on the requested backend
+        
+        `algorithm` is one of PYTHON_ALGORITHMS and `backend` is 'auto' (C++
+        when available), 'cpp' or 'python'. `distances` optionally replaces
+        the Euclidean distances, e.g. with load_distance_matrix() for an
+        external road-network matrix. The backend that actually produced
+        the routes is recorded in `last_backend` and, when verification is
+        enabled, the verify_solution() report in `last_verification`.
+        
+        Before anything is allocated the solve is planned against the
+        admission limits (see plan()); the plan is kept in `last_plan`, a
+        request that does not fit is downgraded to a cheaper algorithm,
+        backend or distance mode, and AdmissionError is raised when nothing
+        fits. The same applies again when a C++ solve falls back to Python
+        (`last_fallback`); `last_plan` then holds the fallback's plan.
+        
+        `progress_callback`, if given, is called on this thread with progress
+        event dicts (algorithm, backend, phase, assigned, total, cost, moves,
+        elapsed and a best-so-far `routes` snapshot) while the solve runs.
+        
+        `improve=False` skips the sweep algorithm's per-route 2-opt pass (e.g.
+        for 100k-stop instances); the other algorithms ignore it.
+        """
+        if algorithm not in PYTHON_ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if distances is not None and len(distances) != len(points):
+            raise ValueError(f"Distance matrix covers {len(distances)} points but the problem has {len(points)}")
+        
+        self.last_fallback = False
+        plan = self.last_plan = self.plan(algorithm, points, backend, distances)
+        algorithm, backend, distances = self._admit(plan, points, distances)
+        
+        if progress_callback is not None:
+            # Tag every event with the algorithm actually running (the plan
+            # is replaced if the solve falls back to Python)
+            callback = progress_callback
+            progress_callback = lambda event: callback(dict(event, algorithm=self.last_plan['algorithm']))
+        
+        self.last_timed_out = False
+        routes = self._run_backend(algorithm, points, vehicle_capacity, num_vehicles, backend, distances,
+                                   progress_callback, improve)
+        algorithm = self.last_plan['algorithm']
+        
+        if self.verify:
+            self.last_verification = verify_solution(points, routes, vehicle_capacity, num_vehicles, distances)
+            if not self.last_verification['feasible']:
+                print(f"⚠️ {algorithm} solution failed verification: {'; '.join(self.last_verification['errors'])}")
+        
+        return routes
+    
+    def _run_backend(self, algorithm, points, vehicle_capacity, num_vehicles, backend, distances=None,
+                     progress_callback=None, improve=True):
+        """Dispatch to the requested backend, falling back to Python if C++ fails
+        
+        The admission plan was made for C++, and the Python version of a solve
+        can need far more memory and time, so a fallback is planned again
+        (and may be downgraded or rejected) before it runs.
+        """
+        if backend == 'python':
+            return self._solve_python(algorithm, points, vehicle_capacity, num_vehicles, distances, progress_callback,
+                                      improve)
+        
+        if self.cpp_executable:
+            try:
+                return self._solve_cpp(algorithm, points, vehicle_capacity, num_vehicles, distances, progress_callback,
+                                       improve)
+            except Exception as e:
+                print(f"❌ C++ solver exception: {e}")
                 print("⚠️ Falling back to Python implementation")
-                solver = VRPAlgorithms(points, vehicle_capacity, num_vehicles)
-                return solver.clarke_wright_algorithm()
-                
-        except Exception as e:
-            print(f"❌ C++ solver exception: {e}")
-            print("⚠️ Falling back to Python implementation")
-            solver = VRPAlgorithms(points, vehicle_capacity, num_vehicles)
-            return solver.clarke_wright_algorithm()
+        else:
+            print(f"⚠️ Using Python {algorithm} algorithm")
+        
+        self.last_fallback = True
+        plan = self.last_plan = self.plan(algorithm, points, 'python', distances)
+        algorithm, _, distances = self._admit(plan, points, distances)
+        return self._solve_python(algorithm, points, vehicle_capacity, num_vehicles, distances, progress_callback,
+                                  improve)
+    
+    def solve_enhanced_custom(self, points, vehicle_capacity, num_vehicles, distances=None, progress_callback=None):
+        """Solve using Enhanced Custom Algorithm"""
+        return self.run('enhanced', points, vehicle_capacity, num_vehicles, distances=distances,
+                        progress_callback=progress_callback)
+    
+    def solve_nearest_neighbor(self, points, vehicle_capacity, num_vehicles, distances=None, progress_callback=None):
+        """Solve using Nearest Neighbor Algorithm"""
+        return self.run('nearest', points, vehicle_capacity, num_vehicles, distances=distances,
+                        progress_callback=progress_callback)
+    
+    def solve_clarke_wright(self, points, vehicle_capacity, num_vehicles, distances=None, progress_callback=None):
+        """Solve using Clarke-Wright Algorithm"""
+        return self.run('clarke', points, vehicle_capacity, num_vehicles, distances=distances,
+                        progress_callback=progress_callback)
+    
+    def solve_sweep(self, points, vehicle_capacity, num_vehicles, distances=None, progress_callback=None,
+                    improve=True):
+        """Solve using Sweep Algorithm (`improve=False` skips its 2-opt pass)"""
+        return self.run('sweep', points, vehicle_capacity, num_vehicles, distances=distances,
+                        progress_callback=progress_callback, improve=improve)
     
     def _fallback_solve(self, points, vehicle_capacity, num_vehicles, algorithm):
         """Fallback to simple Python implementation if C++ fails"""
@@ -286,4 +545,5 @@ if __name__ == "__main__":
     print("Testing C++ VRP Wrapper:")
     print("Enhanced Custom:", wrapper.solve_enhanced_custom(points, 20, 2))
     print("Nearest Neighbor:", wrapper.solve_nearest_neighbor(points, 20, 2))
-    print("Clarke-Wright:", wrapper.solve_clarke_wright(points, 20, 2)) 
\ No newline at end of file
+    print("Clarke-Wright:", wrapper.solve_clarke_wright(points, 20, 2))
+    print("Sweep:", wrapper.solve_sweep(points, 20, 2)) 
\ No newline at end of file